@@ -0,0 +1,62 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# check-startup-time.sh
+# Fail when the Specify CLI starts up slower than a wall-time budget.
+# Usage: .github/workflows/scripts/check-startup-time.sh
+#   Run from the repository root; the CLI is imported from src/ so the working tree is measured.
+#   Each measurement is the best of RUNS attempts (default: 5). Budgets in milliseconds:
+#     IMPORT_MAX_MS : cumulative `python -X importtime -c "import specify_cli"` time (default: 300)
+#     HELP_MAX_MS   : wall time of `specify --help` (default: 1000)
+#   `specify version` shares this startup path; the rest of its time is the release lookup over the network.
+#   Set PYTHON to pick the interpreter (default: python3).
+#   Examples:
+#     $0
+#     RUNS=10 IMPORT_MAX_MS=200 $0
+
+PYTHON="${PYTHON:-python3}"
+RUNS="${RUNS:-5}"
+IMPORT_MAX_MS="${IMPORT_MAX_MS:-300}"
+HELP_MAX_MS="${HELP_MAX_MS:-1000}"
+export PYTHONPATH="src${PYTHONPATH:+:$PYTHONPATH}"
+
+# Byte-compile first so the first run does not pay for it
+"$PYTHON" -m compileall -q src/specify_cli
+
+best_import_us=""
+best_help_ms=""
+for ((i = 0; i < RUNS; i++)); do
+  import_us=$("$PYTHON" -X importtime -c "import specify_cli" 2>&1 \
+    | awk -F'|' '$3 ~ /^ *specify_cli$/ { gsub(/ /, "", $2); print $2 }')
+  if [[ -z "$import_us" ]]; then
+    echo "Could not measure the import time of specify_cli" >&2
+    exit 1
+  fi
+  if [[ -z "$best_import_us" || $import_us -lt $best_import_us ]]; then
+    best_import_us=$import_us
+  fi
+
+  start_ns=$(date +%s%N)
+  "$PYTHON" -c "from specify_cli import main; main()" --help > /dev/null
+  help_ms=$(( ($(date +%s%N) - start_ns) / 1000000 ))
+  if [[ -z "$best_help_ms" || $help_ms -lt $best_help_ms ]]; then
+    best_help_ms=$help_ms
+  fi
+done
+
+import_ms=$(( best_import_us / 1000 ))
+echo "import specify_cli: ${import_ms} ms (budget ${IMPORT_MAX_MS} ms)"
+echo "specify --help:     ${best_help_ms} ms (budget ${HELP_MAX_MS} ms)"
+
+status=0
+if (( import_ms > IMPORT_MAX_MS )); then
+  echo "import specify_cli is over budget; move the slow import into the command that needs it" >&2
+  echo "Slowest imports:" >&2
+  "$PYTHON" -X importtime -c "import specify_cli" 2>&1 | sort -t'|' -k2 -n -r | head -10 >&2
+  status=1
+fi
+if (( best_help_ms > HELP_MAX_MS )); then
+  echo "specify --help is over budget" >&2
+  status=1
+fi
+exit $status
@@ -3,21 +3,35 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N]
+    python validate.py <file.docx> --original <original_file>
+
+A .docx/.pptx/.xlsx file can be given instead of an unpacked directory; its
+parts are then validated straight from the archive.
 """
 
 import argparse
+import os
 import sys
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+# Import the engine as ooxml.scripts.validation from the skill root, the name the
+# Document library uses, so a process using both skills loads a single copy
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from ooxml.scripts.validation import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, or an Office file to validate without unpacking",
     )
     parser.add_argument(
         "--original",
@@ -30,18 +44,35 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD validation (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-check every part instead of reusing results for parts unchanged "
+        "since the last run (cached in .<dir>.validation-cache.json next to <dir>)",
+    )
     args = parser.parse_args()
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or an Office file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
+    jobs = args.jobs or os.cpu_count() or 1
+
     # Run validations
     match file_extension:
         case ".docx":
@@ -55,7 +86,16 @@ def main():
     # Run validators
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        if V is RedliningValidator:
+            validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        else:
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                jobs=jobs,
+                cache=not args.no_cache,
+            )
         if not validator.validate():
             success = False
 
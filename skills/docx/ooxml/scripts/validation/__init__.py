@@ -1,8 +1,14 @@
 """
-Validation modules for Word document processing.
+Validation modules for Office document processing.
+
+The docx and pptx skills ship identical copies of this package, and either copy
+validates both formats. Import it as ooxml.scripts.validation with the skill root
+on sys.path (as validate.py and the docx Document library do): Python then loads
+it once per process, so schemas are compiled and cached once even when both
+skills are on the path.
 """
 
-from .base import BaseSchemaValidator
+from .base import BaseSchemaValidator, warm_schema_cache
 from .docx import DOCXSchemaValidator
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
@@ -12,4 +18,5 @@ __all__ = [
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "warm_schema_cache",
 ]
@@ -2,11 +2,93 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import hashlib
+import json
+import os
+import posixpath
 import re
+import zipfile
 from pathlib import Path
 
 import lxml.etree
 
+# Compiled XSD schemas shared by every validator in the process, keyed by schema path.
+# lxml schemas are not thread-safe, so validators sharing them must run in one thread.
+_SCHEMA_CACHE = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it once per process.
+
+    A schema that fails to compile is cached as its error message and raised
+    as a new XMLSchemaParseError each time, so it is not recompiled for every
+    part that maps to it. Caching the exception itself would grow its traceback
+    on every re-raise and keep each validator in those frames alive.
+    """
+    schema_path = Path(schema_path).resolve()
+    schema = _SCHEMA_CACHE.get(schema_path)
+    if schema is None:
+        try:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+            schema = lxml.etree.XMLSchema(xsd_doc)
+        except lxml.etree.LxmlError as e:
+            schema = str(e)
+        _SCHEMA_CACHE[schema_path] = schema
+    if isinstance(schema, str):
+        raise lxml.etree.XMLSchemaParseError(schema)
+    return schema
+
+
+def warm_schema_cache(schemas_dir=None):
+    """Compile every schema referenced by SCHEMA_MAPPINGS ahead of time.
+
+    Long-running workers can call this at startup so the first document they
+    validate does not pay for schema compilation. Compiled schemas cannot be
+    serialized, so the warm-up has to happen in each process.
+
+    Returns:
+        int: Number of schemas compiled successfully
+    """
+    if schemas_dir is None:
+        schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+    compiled = 0
+    for relative_path in set(BaseSchemaValidator.SCHEMA_MAPPINGS.values()):
+        try:
+            load_schema(Path(schemas_dir) / relative_path)
+            compiled += 1
+        except lxml.etree.LxmlError:
+            continue  # Reported when a part using this schema is validated
+    return compiled
+
+
+# Template tags ({{ ... }}) removed from text before XSD validation
+TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+# Bump when a change to the checks could change results stored in validation caches
+VALIDATION_CACHE_VERSION = 2
+
+# Validator reused by an XSD worker process, created by _init_xsd_worker()
+_WORKER_VALIDATOR = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file):
+    """Process pool initializer: build the validator this worker reuses.
+
+    Each worker fills its own schema and original-error caches as it goes.
+    """
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = validator_class(unpacked_dir, original_file, cache=False)
+
+
+def _validate_file_in_worker(xml_file):
+    """Process pool task: validate one part with the worker's validator."""
+    return _WORKER_VALIDATOR.validate_file_against_xsd(xml_file)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,23 +185,303 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(self, unpacked_dir, original_file, verbose=False, jobs=1, cache=True):
+        """Create a validator for an unpacked directory or an Office file.
+
+        When unpacked_dir is a .docx/.pptx/.xlsx file, its members are read
+        straight from the archive. Parts are still addressed as paths under
+        unpacked_dir (the archive path), so reports look the same in both modes.
+
+        With cache enabled, per-part results are stored next to unpacked_dir
+        by save_validation_cache() and reused for unchanged parts next time.
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Number of processes used for XSD validation (1 validates in-process)
+        self.jobs = jobs
+
+        # Zip-backed mode: the package itself and its member names
+        self.package = None
+        self._package_members = set()
+        if self.unpacked_dir.is_file():
+            self.package = zipfile.ZipFile(self.unpacked_dir, "r")
+            self._package_members = {
+                name for name in self.package.namelist() if not name.endswith("/")
+            }
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        self.xml_files = [f for pattern in patterns for f in self._rglob(pattern)]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees (or the parse error) per file, filled lazily by _parse()
+        self._parsed = {}
+
+        # Original package, opened lazily by _open_original(), and the XSD
+        # errors of its parts keyed by part name
+        self._original_zip = None
+        self._original_members = set()
+        self._original_errors = {}
+
+        # Part names and relationship graph, built lazily by _package_index()
+        self._index = None
+
+        # Clark name -> lowercased local name, filled by _lower_local_name()
+        self._lower_local_names = {}
+
+        # Clark name -> outside OOXML_NAMESPACES, filled by _is_foreign_name()
+        self._foreign_names = {}
+
+        # Incremental validation: results of the previous run for parts whose
+        # content hash is unchanged, and the results computed in this run
+        self.cache_file = None
+        if cache:
+            self.cache_file = self.unpacked_dir.with_name(
+                f".{self.unpacked_dir.name}.validation-cache.json"
+            )
+        self._cache_key = None
+        self._part_hashes = None
+        self._previous_results = None
+        self._current_results = {}
+
+    def _parse(self, xml_file):
+        """Return the parsed tree for a file, parsing it at most once per validator.
+
+        The tree is shared by every check, so callers must treat it as
+        read-only and work on a copy if they need to modify it.
+        A parse failure is cached as well and re-raised on every call.
+        """
+        xml_file = Path(xml_file)
+        parsed = self._parsed.get(xml_file)
+        if parsed is None:
+            try:
+                if self.package is not None:
+                    member = xml_file.relative_to(self.unpacked_dir).as_posix()
+                    with self.package.open(member) as f:
+                        parsed = lxml.etree.parse(f)
+                else:
+                    parsed = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                parsed = e
+            self._parsed[xml_file] = parsed
+        if isinstance(parsed, Exception):
+            raise parsed
+        return parsed
+
+    def _all_files(self):
+        """Return every file in the document, as paths under unpacked_dir."""
+        if self.package is not None:
+            return [self.unpacked_dir / name for name in sorted(self._package_members)]
+        return [f for f in self.unpacked_dir.rglob("*") if f.is_file()]
+
+    def _rglob(self, pattern):
+        """Return the files anywhere in the document whose name matches pattern."""
+        if self.package is not None:
+            return [f for f in self._all_files() if f.match(pattern)]
+        return list(self.unpacked_dir.rglob(pattern))
+
+    def _glob(self, pattern):
+        """Return the files matching a pattern relative to the document root."""
+        if self.package is not None:
+            depth = len(Path(pattern).parts)
+            return [
+                f
+                for f in self._all_files()
+                if len(f.relative_to(self.unpacked_dir).parts) == depth
+                and f.match(pattern)
+            ]
+        return list(self.unpacked_dir.glob(pattern))
+
+    def _is_file(self, path):
+        """Return True if path names a file in the document."""
+        try:
+            part_name = Path(path).relative_to(self.unpacked_dir).as_posix()
+        except ValueError:
+            return False
+        return part_name in self._package_index()["parts"]
+
+    def _package_index(self):
+        """Return the part index of the document, building it on first use.
+
+        The index holds:
+            files: part names (posix, relative to the root) in discovery order
+            parts: the same names as a set
+            relationships: .rels part name -> list of relationship dicts with
+                id, type, target, line and part (the normalized part name the
+                target points to, or None for external and empty targets),
+                or the exception raised while parsing that .rels file
+        """
+        if self._index is None:
+            files = [
+                f.relative_to(self.unpacked_dir).as_posix() for f in self._all_files()
+            ]
+            relationships = {}
+            for rels_name in files:
+                if not rels_name.endswith(".rels"):
+                    continue
+                try:
+                    relationships[rels_name] = self._read_relationships(rels_name)
+                except Exception as e:
+                    relationships[rels_name] = e
+            self._index = {
+                "files": files,
+                "parts": set(files),
+                "relationships": relationships,
+            }
+        return self._index
+
+    def _read_relationships(self, rels_name):
+        """Parse a .rels part into the relationship dicts stored in the index."""
+        rels_root = self._parse(self.unpacked_dir / rels_name).getroot()
+
+        # Targets are relative to the source part's folder: the parent of _rels/
+        source_dir = posixpath.dirname(posixpath.dirname(rels_name))
+
+        relationships = []
+        for rel in rels_root.findall(
+            f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            target = rel.get("Target")
+            part = None
+            if target and not target.startswith(("http", "mailto:")):
+                if target.startswith("/"):
+                    # Absolute targets are relative to the package root
+                    part = posixpath.normpath(target.lstrip("/"))
+                else:
+                    part = posixpath.normpath(posixpath.join(source_dir, target))
+            relationships.append(
+                {
+                    "id": rel.get("Id"),
+                    "type": rel.get("Type", ""),
+                    "target": target,
+                    "part": part,
+                    "line": rel.sourceline,
+                }
+            )
+        return relationships
+
+    def _relationships(self, rels_file):
+        """Return the indexed relationships of a .rels file.
+
+        Raises KeyError if the file does not exist and re-raises its parse error.
+        """
+        rels_name = Path(rels_file).relative_to(self.unpacked_dir).as_posix()
+        relationships = self._package_index()["relationships"][rels_name]
+        if isinstance(relationships, Exception):
+            raise relationships
+        return relationships
+
+    def _part_name(self, xml_file):
+        """Return the part name (posix, relative to the root) of a file."""
+        return Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+
+    def _get_part_hashes(self):
+        """Return the sha256 of every XML and .rels part, hashing them once."""
+        if self._part_hashes is None:
+            self._part_hashes = {}
+            for xml_file in self.xml_files:
+                part_name = self._part_name(xml_file)
+                if self.package is not None:
+                    data = self.package.read(part_name)
+                else:
+                    data = xml_file.read_bytes()
+                self._part_hashes[part_name] = hashlib.sha256(data).hexdigest()
+        return self._part_hashes
+
+    def _validation_cache_key(self):
+        """Return what cached results depend on besides the parts themselves."""
+        if self._cache_key is None:
+            original_hash = hashlib.sha256()
+            with open(self.original_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    original_hash.update(chunk)
+            self._cache_key = {
+                "version": VALIDATION_CACHE_VERSION,
+                "validator": type(self).__name__,
+                "original": original_hash.hexdigest(),
+            }
+        return self._cache_key
+
+    def _get_previous_results(self):
+        """Return the cached results of parts unchanged since the last run."""
+        if self._previous_results is None:
+            self._previous_results = {}
+            if self.cache_file is None:
+                return self._previous_results
+            try:
+                cached = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                return self._previous_results
+            if cached.get("key") != self._validation_cache_key():
+                return self._previous_results
+
+            part_hashes = self._get_part_hashes()
+            for part_name, entry in cached.get("parts", {}).items():
+                if entry.get("hash") == part_hashes.get(part_name):
+                    self._previous_results[part_name] = entry
+        return self._previous_results
+
+    def _cached_result(self, xml_file, check, neighbour=None):
+        """Return the previous result of a check on an unchanged part, or None.
+
+        neighbour names another part the result depends on, such as the
+        part's .rels file. The result is only reused if it is unchanged too.
+        """
+        if self.cache_file is None:
+            return None
+        entry = self._get_previous_results().get(self._part_name(xml_file), {})
+        if check not in entry:
+            return None
+        neighbour_hash, result = entry[check]
+        if neighbour_hash != self._neighbour_hash(neighbour):
+            return None
+        return result
+
+    def _remember_result(self, xml_file, check, result, neighbour=None):
+        """Record a check result for save_validation_cache(). Results must be JSON-serializable."""
+        if self.cache_file is None:
+            return
+        entry = self._current_results.setdefault(self._part_name(xml_file), {})
+        entry[check] = [self._neighbour_hash(neighbour), result]
+
+    def _neighbour_hash(self, neighbour):
+        """Return the content hash of a neighbour part (None if there is none)."""
+        if neighbour is None:
+            return None
+        return self._get_part_hashes().get(self._part_name(neighbour))
+
+    def save_validation_cache(self):
+        """Write per-part results next to unpacked_dir so the next run can reuse them."""
+        if self.cache_file is None:
+            return
+        previous_results = self._get_previous_results()
+        parts = {}
+        for part_name, part_hash in self._get_part_hashes().items():
+            entry = dict(previous_results.get(part_name, {}))
+            entry.update(self._current_results.get(part_name, {}))
+            entry["hash"] = part_hash
+            parts[part_name] = entry
+
+        cached = {"key": self._validation_cache_key(), "parts": parts}
+        temp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        try:
+            temp_file.write_text(json.dumps(cached))
+            os.replace(temp_file, self.cache_file)
+        except OSError:
+            pass  # The cache is an optimization; a read-only location just disables it
+
+    def _resolve(self, path):
+        """Normalize a part path. Zip members cannot be symlinks, so only '..' is folded."""
+        if self.package is not None:
+            return Path(os.path.normpath(path))
+        return Path(path).resolve()
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -131,7 +493,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +521,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -189,80 +551,33 @@ class BaseSchemaValidator:
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            # Per-file findings only depend on the file itself, so unchanged
+            # files replay them from the cache; global IDs are checked below
+            id_events = self._cached_result(xml_file, "ids")
+            if id_events is None:
+                id_events = self._find_unique_id_events(xml_file)
+                self._remember_result(xml_file, "ids", id_events)
+
+            for event in id_events:
+                if event[0] != "global":
+                    errors.append(event[1])
+                    continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+                # Check global uniqueness
+                _, id_value, line, tag = event
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,99 +589,134 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _find_unique_id_events(self, xml_file):
+        """Collect the ID uniqueness findings of a single file.
+
+        Returns a JSON-serializable list of events in document order:
+        ["error", message] for per-file violations and parse errors, and
+        ["global", id_value, line, tag] for IDs that must be unique across
+        files, which validate_unique_ids() checks against the other files.
+        """
+        events = []
+        try:
+            root = self._parse(xml_file).getroot()
+            file_ids = {}  # Track IDs that must be unique within this file
+
+            # IDs inside mc:AlternateContent are ignored; collect them up front
+            # instead of removing the elements, so the shared tree is not modified
+            alternate_content = set()
+            for elem in root.iter(f"{{{self.MC_NAMESPACE}}}AlternateContent"):
+                alternate_content.update(elem.iter())
+
+            # Element and attribute names are matched case-insensitively; the
+            # lowercased local name of each distinct Clark name is memoized
+            requirements = self.UNIQUE_ID_REQUIREMENTS
+            lower_local_name = self._lower_local_name
+            for elem in root.iter(lxml.etree.Element):
+                tag = lower_local_name(elem.tag)
+                if tag not in requirements:
+                    continue
+                if alternate_content and elem in alternate_content:
+                    continue
+                attr_name, scope = requirements[tag]
+
+                # Look for the specified attribute
+                id_value = None
+                for attr, value in elem.attrib.items():
+                    if lower_local_name(attr) == attr_name:
+                        id_value = value
+                        break
+
+                if id_value is not None:
+                    if scope == "global":
+                        events.append(["global", id_value, elem.sourceline, tag])
+                    elif scope == "file":
+                        # Check file-level uniqueness
+                        key = (tag, attr_name)
+                        if key not in file_ids:
+                            file_ids[key] = {}
+
+                        if id_value in file_ids[key]:
+                            prev_line = file_ids[key][id_value]
+                            events.append(
+                                [
+                                    "error",
+                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                    f"(first occurrence at line {prev_line})",
+                                ]
+                            )
+                        else:
+                            file_ids[key][id_value] = elem.sourceline
+
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            events.append(
+                ["error", f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"]
+            )
+
+        return events
+
+    def _lower_local_name(self, clark_name):
+        """Return the lowercased local part of a Clark name, memoized per name."""
+        local_name = self._lower_local_names.get(clark_name)
+        if local_name is None:
+            local_name = clark_name.rpartition("}")[2].lower()
+            self._lower_local_names[clark_name] = local_name
+        return local_name
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
 
-        # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        index = self._package_index()
+        relationships_by_file = index["relationships"]
 
-        if not rels_files:
+        if not relationships_by_file:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Get all files in the package (excluding reference files)
+        all_files = [
+            name
+            for name in index["files"]
+            if posixpath.basename(name) != "[Content_Types].xml"
+            and not name.endswith(".rels")
+        ]  # These files are not referenced by .rels
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(relationships_by_file)} .rels files and {len(all_files)} target files"
             )
 
-        # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+        # Check each .rels file against the index, without touching the filesystem
+        for rels_name, relationships in relationships_by_file.items():
+            rel_path = Path(rels_name)
+            if isinstance(relationships, Exception):
+                errors.append(f"  Error parsing {rel_path}: {relationships}")
+                continue
 
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+            for rel in relationships:
+                if rel["part"] is None:
+                    continue  # Skip external URLs
+                if rel["part"] in index["parts"]:
+                    all_referenced_files.add(rel["part"])
+                else:
+                    errors.append(
+                        f"  {rel_path}: Line {rel['line']}: Broken reference to {rel['target']}"
+                    )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+                errors.append(f"  Unreferenced file: {Path(unref_file)}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,8 +740,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -406,25 +754,30 @@ class BaseSchemaValidator:
             rels_file = rels_dir / f"{xml_file.name}.rels"
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self._is_file(rels_file):
+                continue
+
+            # Results depend on the file and its .rels, so reuse them only if
+            # neither changed since the last run
+            cached_errors = self._cached_result(xml_file, "rids", rels_file)
+            if cached_errors is not None:
+                errors.extend(cached_errors)
                 continue
 
+            file_errors = []
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Get valid relationship IDs and their types from the package index
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
+                for rel in self._relationships(rels_file):
+                    rid = rel["id"]
+                    rel_type = rel["type"]
                     if rid:
                         # Check for duplicate rIds
                         if rid in rid_to_type:
                             rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
+                            file_errors.append(
+                                f"  {rels_rel_path}: Line {rel['line']}: "
                                 f"Duplicate relationship ID '{rid}' (IDs must be unique)"
                             )
                         # Extract just the type name from the full URL
@@ -434,7 +787,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -448,7 +801,7 @@ class BaseSchemaValidator:
 
                         # Check if the ID exists
                         if rid_attr not in rid_to_type:
-                            errors.append(
+                            file_errors.append(
                                 f"  {xml_rel_path}: Line {elem.sourceline}: "
                                 f"<{elem_name}> references non-existent relationship '{rid_attr}' "
                                 f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
@@ -462,7 +815,7 @@ class BaseSchemaValidator:
                                 actual_type = rid_to_type[rid_attr]
                                 # Check if the actual type matches or contains the expected type
                                 if expected_type not in actual_type.lower():
-                                    errors.append(
+                                    file_errors.append(
                                         f"  {xml_rel_path}: Line {elem.sourceline}: "
                                         f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
                                         f"but should point to a '{expected_type}' relationship"
@@ -470,7 +823,10 @@ class BaseSchemaValidator:
 
             except Exception as e:
                 xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+                file_errors.append(f"  Error processing {xml_rel_path}: {e}")
+
+            self._remember_result(xml_file, "rids", file_errors, rels_file)
+            errors.extend(file_errors)
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -525,13 +881,13 @@ class BaseSchemaValidator:
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self._is_file(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -576,8 +932,7 @@ class BaseSchemaValidator:
             }
 
             # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = self._all_files()
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,7 +948,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -649,13 +1004,11 @@ class BaseSchemaValidator:
             tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
         """
         # Resolve both paths to handle symlinks
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
+        xml_file = self._resolve(xml_file)
+        unpacked_dir = self.unpacked_dir
 
         # Validate current file
-        is_valid, current_errors = self._validate_single_file_xsd(
-            xml_file, unpacked_dir
-        )
+        is_valid, current_errors = self._validate_single_file_xsd(xml_file)
 
         if is_valid is None:
             return None, set()  # Skipped
@@ -673,7 +1026,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +1045,9 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd()
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +1063,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +1089,44 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Return validate_file_against_xsd() results for self.xml_files, in order.
+
+        Parts unchanged since the last run reuse their cached result. With
+        jobs > 1 the remaining parts are spread over a process pool; results
+        still come back in file order, so the report does not depend on which
+        worker finishes first.
+        """
+        results = {}
+        pending = []
+        for xml_file in self.xml_files:
+            cached = self._cached_result(xml_file, "xsd")
+            if cached is None:
+                pending.append(xml_file)
+            else:
+                results[xml_file] = (cached[0], set(cached[1]))
+
+        if self.jobs <= 1 or len(pending) < 2:
+            computed = [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in pending
+            ]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=min(self.jobs, len(pending)),
+                initializer=_init_xsd_worker,
+                initargs=(type(self), self.unpacked_dir, self.original_file),
+            ) as executor:
+                computed = list(executor.map(_validate_file_in_worker, pending))
+
+        for xml_file, (is_valid, new_errors) in zip(pending, computed):
+            self._remember_result(xml_file, "xsd", [is_valid, sorted(new_errors)])
+            results[xml_file] = (is_valid, new_errors)
+
+        return [results[xml_file] for xml_file in self.xml_files]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,189 +1151,148 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
-
-        return lxml.etree.ElementTree(xml_copy)
+    def _preprocess_for_xsd(self, xml_doc, clean_namespaces):
+        """Return a cleaned copy of a parsed part, ready for XSD validation.
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
-
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
-
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
-
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
-
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
-
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
-
-        return xml_doc
+        Works in one pass over a single copy (the input tree is not modified):
+        - removes mc:Ignorable from the root element
+        - removes template tags ({{ ... }}) from text and tails, except in
+          text elements (w:t, a:t, ...), keeping the XML structure intact
+        - with clean_namespaces, removes attributes and elements that are not
+          in OOXML_NAMESPACES
+        """
+        root = copy.deepcopy(xml_doc.getroot())
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
+
+        foreign_elements = []
+        for elem in root.iter(lxml.etree.Element):
+            tag = elem.tag
+            if clean_namespaces:
+                if self._is_foreign_name(tag):
+                    foreign_elements.append(elem)
+                attrib = elem.attrib
+                if attrib:
+                    for attr in [a for a in attrib if self._is_foreign_name(a)]:
+                        del attrib[attr]
+
+            if not (tag.endswith("}t") or tag == "t"):
+                text = elem.text
+                if text and "{{" in text:
+                    elem.text = TEMPLATE_TAG_PATTERN.sub("", text)
+                tail = elem.tail
+                if tail and "{{" in tail:
+                    elem.tail = TEMPLATE_TAG_PATTERN.sub("", tail)
+
+        # Removing an element also drops its tail and everything below it
+        for elem in foreign_elements:
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
+
+        return lxml.etree.ElementTree(root)
+
+    def _is_foreign_name(self, name):
+        """Return True if a Clark name is in a namespace outside OOXML_NAMESPACES."""
+        foreign = self._foreign_names.get(name)
+        if foreign is None:
+            foreign = (
+                name.startswith("{")
+                and name[1:].partition("}")[0] not in self.OOXML_NAMESPACES
+            )
+            self._foreign_names[name] = foreign
+        return foreign
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+    def _validate_single_file_xsd(self, xml_file):
+        """Validate a single unpacked XML file against XSD schema. Returns (is_valid, errors_set)."""
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
-
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
-
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
-
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+            # Preprocessing works on a copy, so the shared parsed tree is never modified
+            return self._validate_xml_doc_xsd(
+                self._parse(xml_file),
+                schema_path,
+                xml_file.relative_to(self.unpacked_dir),
+            )
 
         except Exception as e:
             return False, {str(e)}
 
+    def _validate_xml_doc_xsd(self, xml_doc, schema_path, relative_path):
+        """Preprocess a parsed part and validate it. Returns (is_valid, errors_set)."""
+        # Load schema (compiled once per process, see load_schema)
+        schema = load_schema(schema_path)
+
+        # Strip template tags and mc:Ignorable, plus non-OOXML namespaces in
+        # the main content folders
+        xml_doc = self._preprocess_for_xsd(
+            xml_doc,
+            clean_namespaces=bool(relative_path.parts)
+            and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS,
+        )
+
+        # Validate
+        if schema.validate(xml_doc):
+            return True, set()
+        else:
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+            return False, errors
+
+    def _open_original(self):
+        """Return the original package as an open zip, opening it once per validator."""
+        if self._original_zip is None:
+            self._original_zip = zipfile.ZipFile(self.original_file, "r")
+            self._original_members = set(self._original_zip.namelist())
+        return self._original_zip
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read straight from the original zip rather than extracting
+        the package, and the result is cached so each part is validated at most
+        once per validator.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        xml_file = self._resolve(xml_file)
+        relative_path = xml_file.relative_to(self.unpacked_dir)
+        member = relative_path.as_posix()
+
+        errors = self._original_errors.get(member)
+        if errors is None:
+            errors = self._compute_original_errors(xml_file, relative_path, member)
+            self._original_errors[member] = errors
+        return errors
+
+    def _compute_original_errors(self, xml_file, relative_path, member):
+        """Validate one member of the original package. Returns its error set."""
+        zip_ref = self._open_original()
+        if member not in self._original_members:
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        try:
+            with zip_ref.open(member) as f:
+                xml_doc = lxml.etree.parse(f)
+            is_valid, errors = self._validate_xml_doc_xsd(
+                xml_doc, schema_path, relative_path
             )
-            return errors if errors else set()
-
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
-
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
-
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
-
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
-
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
-
-        return lxml.etree.ElementTree(xml_copy), warnings
+        except Exception as e:
+            errors = {str(e)}
+        return errors if errors else set()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@
 #     "rich",
 #     "platformdirs",
 #     "readchar",
-#     "httpx",
+#     "httpx[socks,http2]",
 # ]
 # ///
 """
@@ -32,29 +32,51 @@ import tempfile
 import shutil
 import shlex
 import json
+import io
+import threading
+import contextlib
+import hashlib
+import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple
 
 import typer
-import httpx
+import platformdirs
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
-from rich.live import Live
 from rich.align import Align
 from rich.table import Table
 from rich.tree import Tree
 from typer.core import TyperGroup
 
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
 from datetime import datetime, timezone
 
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-client = httpx.Client(verify=ssl_context)
+# httpx, truststore, readchar, asyncio and the rich live/progress widgets are
+# imported where they are used: `specify --help` and `specify check` never need
+# them, and the CLI is invoked from tight shell loops.
+if TYPE_CHECKING:
+    import httpx
+
+_ssl_context = None
+_client = None
+
+def _get_ssl_context():
+    """Return the shared truststore SSL context, creating it on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        import truststore
+        _ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    return _ssl_context
+
+def _get_client() -> "httpx.Client":
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        import httpx
+        _client = httpx.Client(verify=_get_ssl_context())
+    return _client
 
 def _github_token(cli_token: str | None = None) -> str | None:
     """Return sanitized GitHub token (cli arg takes precedence) or None."""
@@ -65,7 +87,7 @@ def _github_auth_headers(cli_token: str | None = None) -> dict:
     token = _github_token(cli_token)
     return {"Authorization": f"Bearer {token}"} if token else {}
 
-def _parse_rate_limit_headers(headers: httpx.Headers) -> dict:
+def _parse_rate_limit_headers(headers: "httpx.Headers") -> dict:
     """Extract and parse GitHub rate-limit headers."""
     info = {}
     
@@ -93,7 +115,7 @@ def _parse_rate_limit_headers(headers: httpx.Headers) -> dict:
     
     return info
 
-def _format_rate_limit_error(status_code: int, headers: httpx.Headers, url: str) -> str:
+def _format_rate_limit_error(status_code: int, headers: "httpx.Headers", url: str) -> str:
     """Format a user-friendly error message with rate-limit information."""
     rate_info = _parse_rate_limit_headers(headers)
     
@@ -232,6 +254,27 @@ SCRIPT_TYPE_CHOICES = {"sh": "POSIX Shell (bash/zsh)", "ps": "PowerShell"}
 
 CLAUDE_LOCAL_PATH = Path.home() / ".claude" / "local" / "claude"
 
+# Upper bound for the on-disk template cache (override with SPECIFY_CACHE_MAX_BYTES)
+TEMPLATE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Template archives are small; downloads stay in memory unless they exceed this size
+TEMPLATE_SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# Interrupted downloads older than this are not resumed and get pruned from the cache
+PARTIAL_DOWNLOAD_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Interrupted downloads resume with HTTP Range requests, backing off exponentially
+DOWNLOAD_MAX_ATTEMPTS = 5
+DOWNLOAD_BACKOFF_SECONDS = 1.0
+DOWNLOAD_RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Records the hash of every installed template file so `specify upgrade` can skip unchanged ones
+TEMPLATE_MANIFEST_PATH = ".specify/template-manifest.json"
+
+# A probe that has not answered within this many seconds is reported as timed out
+TOOL_PROBE_TIMEOUT = 5.0
+
 BANNER = """
 ███████╗██████╗ ███████╗ ██████╗██╗███████╗██╗   ██╗
 ██╔════╝██╔══██╗██╔════╝██╔════╝██║██╔════╝╚██╗ ██╔╝
@@ -245,20 +288,46 @@ TAGLINE = "Spec Kit Chinese - Spec-Driven Development Toolkit"
 class StepTracker:
     """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
     Supports live auto-refresh via an attached refresh callback.
+
+    Steps are indexed by key, each step's line is formatted only when it
+    changes, and refresh callbacks are coalesced to at most one per
+    refresh interval. Pass the tracker itself to Live: it implements
+    __rich__, so Live's own refresh picks up any change made between callbacks.
+
+    Every step also records monotonic start/end times (set by start() and by
+    the terminal statuses) and optionally the bytes it transferred, for
+    timings_table() and trace_events().
     """
+    STATUS_SYMBOLS = {
+        "done": "[green]●[/green]",
+        "pending": "[green dim]○[/green dim]",
+        "running": "[cyan]○[/cyan]",
+        "error": "[red]●[/red]",
+        "skipped": "[yellow]○[/yellow]",
+    }
+
     def __init__(self, title: str):
         self.title = title
-        self.steps = []  # list of dicts: {key, label, status, detail}
+        self.steps = {}  # ordered by insertion: key -> {key, label, status, detail, line, started, ended, bytes}
         self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
         self._refresh_cb = None  # callable to trigger UI refresh
+        self._refresh_interval = 0.0
+        self._last_refresh = 0.0
+        self._tree = None  # cached render, invalidated on any change
+        self._lock = threading.RLock()
+        self.created = time.monotonic()
 
-    def attach_refresh(self, cb):
+    def attach_refresh(self, cb, refresh_per_second: float = 8):
         self._refresh_cb = cb
+        self._refresh_interval = 1.0 / refresh_per_second if refresh_per_second else 0.0
 
     def add(self, key: str, label: str):
-        if key not in [s["key"] for s in self.steps]:
-            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
-            self._maybe_refresh()
+        with self._lock:
+            if key in self.steps:
+                return
+            self.steps[key] = self._format(self._new_step(key, label, "pending", ""))
+            self._tree = None
+        self._maybe_refresh()
 
     def start(self, key: str, detail: str = ""):
         self._update(key, status="running", detail=detail)
@@ -272,63 +341,146 @@ class StepTracker:
     def skip(self, key: str, detail: str = ""):
         self._update(key, status="skipped", detail=detail)
 
-    def _update(self, key: str, status: str, detail: str):
-        for s in self.steps:
-            if s["key"] == key:
-                s["status"] = status
-                if detail:
-                    s["detail"] = detail
-                self._maybe_refresh()
+    def record(self, key: str, *, started: float | None = None, ended: float | None = None, nbytes: int | None = None):
+        """Override a step's monotonic timestamps or set the bytes it transferred."""
+        with self._lock:
+            step = self.steps.get(key)
+            if step is None:
                 return
+            if started is not None:
+                step["started"] = started
+            if ended is not None:
+                step["ended"] = ended
+            if nbytes is not None:
+                step["bytes"] = nbytes
+
+    def _new_step(self, key: str, label: str, status: str, detail: str) -> dict:
+        return {"key": key, "label": label, "status": status, "detail": detail, "started": None, "ended": None, "bytes": None}
 
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
+    def _update(self, key: str, status: str, detail: str):
+        now = time.monotonic()
+        with self._lock:
+            step = self.steps.get(key)
+            if step is None:
+                step = self.steps[key] = self._new_step(key, key, status, detail)
+            else:
+                step["status"] = status
+                if detail:
+                    step["detail"] = detail
+            if status == "running":
+                if step["started"] is None:
+                    step["started"] = now
+            else:
+                # Steps completed without start() are recorded as instantaneous
+                step["ended"] = now
+                if step["started"] is None:
+                    step["started"] = now
+            self._format(step)
+            self._tree = None
         self._maybe_refresh()
 
     def _maybe_refresh(self):
-        if self._refresh_cb:
-            try:
-                self._refresh_cb()
-            except Exception:
-                pass
+        if not self._refresh_cb:
+            return
+        now = time.monotonic()
+        if now - self._last_refresh < self._refresh_interval:
+            return
+        self._last_refresh = now
+        try:
+            self._refresh_cb()
+        except Exception:
+            pass
 
-    def render(self):
-        tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
-        for step in self.steps:
-            label = step["label"]
-            detail_text = step["detail"].strip() if step["detail"] else ""
-
-            status = step["status"]
-            if status == "done":
-                symbol = "[green]●[/green]"
-            elif status == "pending":
-                symbol = "[green dim]○[/green dim]"
-            elif status == "running":
-                symbol = "[cyan]○[/cyan]"
-            elif status == "error":
-                symbol = "[red]●[/red]"
-            elif status == "skipped":
-                symbol = "[yellow]○[/yellow]"
+    def _format(self, step: dict) -> dict:
+        """Render a single step's line and store it on the step."""
+        label = step["label"]
+        detail_text = step["detail"].strip() if step["detail"] else ""
+        status = step["status"]
+        symbol = self.STATUS_SYMBOLS.get(status, " ")
+
+        if status == "pending":
+            # Entire line light gray (pending)
+            if detail_text:
+                line = f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
             else:
-                symbol = " "
-
-            if status == "pending":
-                # Entire line light gray (pending)
-                if detail_text:
-                    line = f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [bright_black]{label}[/bright_black]"
+                line = f"{symbol} [bright_black]{label}[/bright_black]"
+        else:
+            # Label white, detail (if any) light gray in parentheses
+            if detail_text:
+                line = f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
             else:
-                # Label white, detail (if any) light gray in parentheses
-                if detail_text:
-                    line = f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [white]{label}[/white]"
+                line = f"{symbol} [white]{label}[/white]"
+
+        step["line"] = line
+        return step
 
-            tree.add(line)
-        return tree
+    def render(self):
+        with self._lock:
+            if self._tree is None:
+                tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
+                for step in self.steps.values():
+                    tree.add(step["line"])
+                self._tree = tree
+            return self._tree
+
+    def __rich__(self):
+        return self.render()
+
+    def timings_table(self) -> Table:
+        """Return a table of per-step durations and transferred bytes."""
+        table = Table(title="步骤耗时", show_edge=False, box=None, padding=(0, 2))
+        table.add_column("步骤", style="cyan")
+        table.add_column("状态")
+        table.add_column("开始", justify="right", style="bright_black")
+        table.add_column("耗时", justify="right")
+        table.add_column("字节", justify="right")
+        with self._lock:
+            steps = list(self.steps.values())
+        for step in steps:
+            if step["started"] is None:
+                table.add_row(step["label"], step["status"], "-", "-", "-")
+                continue
+            ended = step["ended"] if step["ended"] is not None else time.monotonic()
+            table.add_row(
+                step["label"],
+                step["status"],
+                f"+{(step['started'] - self.created) * 1000:.0f} ms",
+                f"{(ended - step['started']) * 1000:.1f} ms",
+                f"{step['bytes']:,}" if step["bytes"] is not None else "-",
+            )
+        return table
+
+    def trace_events(self) -> dict:
+        """Return the recorded steps as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        events = []
+        pid = os.getpid()
+        with self._lock:
+            steps = list(self.steps.values())
+        for step in steps:
+            if step["started"] is None:
+                continue
+            ended = step["ended"] if step["ended"] is not None else step["started"]
+            args = {"key": step["key"], "status": step["status"]}
+            if step["detail"]:
+                args["detail"] = step["detail"]
+            if step["bytes"] is not None:
+                args["bytes"] = step["bytes"]
+            events.append({
+                "name": step["label"],
+                "cat": "specify",
+                "ph": "X",
+                "ts": round((step["started"] - self.created) * 1_000_000),
+                "dur": round((ended - step["started"]) * 1_000_000),
+                "pid": pid,
+                "tid": 1,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"title": self.title}}
 
 def get_key():
     """Get a single keypress in a cross-platform way using readchar."""
+    import readchar
+
     key = readchar.readkey()
 
     if key == readchar.key.UP or key == readchar.key.CTRL_P:
@@ -359,6 +511,8 @@ def select_with_arrows(options: dict, prompt_text: str = "选择一个选项", d
     Returns:
         Selected option key
     """
+    from rich.live import Live
+
     option_keys = list(options.keys())
     if default_key and default_key in option_keys:
         selected_index = option_keys.index(default_key)
@@ -481,6 +635,107 @@ def run_command(cmd: list[str], check_return: bool = True, capture: bool = False
             raise
         return None
 
+_tool_cache_lock = threading.Lock()
+_tool_cache_state = None
+_tool_cache_dirty = False
+
+def _path_fingerprint() -> Tuple[str, dict]:
+    """Return a key for the current search PATH and the mtime of each PATH directory."""
+    entries = [os.path.abspath(entry or os.curdir) for entry in os.environ.get("PATH", os.defpath).split(os.pathsep)]
+    key = os.pathsep.join(entries) + "|" + os.environ.get("PATHEXT", "")
+    mtimes = {}
+    for entry in dict.fromkeys(entries):
+        try:
+            mtimes[entry] = os.stat(entry).st_mtime_ns
+        except OSError:
+            mtimes[entry] = None
+    return key, mtimes
+
+def _load_tool_cache() -> dict:
+    """Load the tool detection cache once per process, discarding it if PATH changed.
+
+    Adding, removing or renaming an executable in any PATH directory changes
+    that directory's mtime, so cached results (including "not found") are only
+    reused while every PATH directory is untouched. Callers hold _tool_cache_lock.
+    """
+    global _tool_cache_state
+    if _tool_cache_state is None:
+        path_key, dir_mtimes = _path_fingerprint()
+        try:
+            data = json.loads((_cache_root() / "tools.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        tools = {}
+        if data.get("path_key") == path_key and data.get("dirs") == dir_mtimes:
+            tools = data.get("tools", {})
+        _tool_cache_state = {"path_key": path_key, "dirs": dir_mtimes, "tools": tools}
+    return _tool_cache_state
+
+def _save_tool_cache(state: dict) -> None:
+    """Write the tool detection cache to disk atomically. Callers hold _tool_cache_lock."""
+    cache_path = _cache_root() / "tools.json"
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is only an optimization; an unwritable cache dir must not break detection
+        pass
+
+def _flush_tool_cache() -> None:
+    """Persist lookups recorded by _cached_which since the last flush, if any."""
+    global _tool_cache_dirty
+    with _tool_cache_lock:
+        if _tool_cache_dirty:
+            _save_tool_cache(_tool_cache_state)
+            _tool_cache_dirty = False
+
+def _cached_which(tool: str) -> str | None:
+    """shutil.which() backed by the persistent detection cache.
+
+    A cached hit costs one stat of the executable; its mtime must still match,
+    so upgrading a tool in place invalidates the entry. Misses are only
+    recorded in memory; _flush_tool_cache() writes them out.
+    """
+    global _tool_cache_dirty
+    with _tool_cache_lock:
+        entry = _load_tool_cache()["tools"].get(tool)
+    if entry is not None:
+        if entry["path"] is None:
+            return None
+        try:
+            if os.stat(entry["path"]).st_mtime_ns == entry["mtime"]:
+                return entry["path"]
+        except OSError:
+            pass
+
+    path = shutil.which(tool)
+    mtime = None
+    if path:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+    with _tool_cache_lock:
+        _load_tool_cache()["tools"][tool] = {"path": path, "mtime": mtime}
+        _tool_cache_dirty = True
+    return path
+
+def locate_tool(tool: str) -> str | None:
+    """Return the path of an installed tool, or None if it cannot be found."""
+    # Special handling for Claude CLI after `claude migrate-installer`
+    # See: https://github.com/renhongliang/spec-kit-chinese/issues/123
+    # The migrate-installer command REMOVES the original executable from PATH
+    # and creates an alias at ~/.claude/local/claude instead
+    # This path should be prioritized over other claude executables in PATH
+    if tool == "claude":
+        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
+            return str(CLAUDE_LOCAL_PATH)
+
+    return _cached_which(tool)
+
 def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     """Check if a tool is installed. Optionally update tracker.
     
@@ -491,18 +746,8 @@ def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     Returns:
         True if tool is found, False otherwise
     """
-    # Special handling for Claude CLI after `claude migrate-installer`
-    # See: https://github.com/renhongliang/spec-kit-chinese/issues/123
-    # The migrate-installer command REMOVES the original executable from PATH
-    # and creates an alias at ~/.claude/local/claude instead
-    # This path should be prioritized over other claude executables in PATH
-    if tool == "claude":
-        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
-            if tracker:
-                tracker.complete(tool, "可用")
-            return True
-    
-    found = shutil.which(tool) is not None
+    found = locate_tool(tool) is not None
+    _flush_tool_cache()
     
     if tracker:
         if found:
@@ -512,44 +757,114 @@ def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     
     return found
 
+def detect_tools(tools: list[str], *, timeout: float = TOOL_PROBE_TIMEOUT, tracker: StepTracker | None = None) -> dict[str, dict]:
+    """Probe several tools concurrently, one daemon thread per tool.
+
+    Each probe gets `timeout` seconds; probes still running after that are
+    reported as timed out and abandoned. Daemon threads are not joined at
+    interpreter exit, so a hung probe does not hold the process open and the
+    whole call (and the CLI run) is bounded by `timeout`. Results are pushed
+    into the tracker from the calling thread as they arrive, and the
+    detection cache is written once after the probes have reported.
+
+    Returns:
+        Dict mapping each tool to {"status": "available" | "missing" | "timeout", "path": str | None}
+    """
+    import queue
+
+    results = {}
+    if not tools:
+        return results
+
+    done: queue.SimpleQueue = queue.SimpleQueue()
+
+    def probe(tool: str) -> None:
+        try:
+            path = locate_tool(tool)
+        except Exception:
+            path = None
+        done.put((tool, path))
+
+    for tool in tools:
+        threading.Thread(target=probe, args=(tool,), name=f"specify-probe-{tool}", daemon=True).start()
+
+    deadline = time.monotonic() + timeout
+    while len(results) < len(tools):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            tool, path = done.get(timeout=remaining)
+        except queue.Empty:
+            break
+        results[tool] = {"status": "available" if path else "missing", "path": path}
+        if tracker:
+            if path:
+                tracker.complete(tool, "可用")
+            else:
+                tracker.error(tool, "未找到")
+    for tool in tools:
+        if tool not in results:
+            results[tool] = {"status": "timeout", "path": None}
+            if tracker:
+                tracker.error(tool, f"{timeout:g} 秒内未响应")
+
+    _flush_tool_cache()
+    return results
+
 def is_git_repo(path: Path = None) -> bool:
-    """Check if the specified path is inside a git repository."""
+    """Check if the specified path is inside a git repository.
+
+    Walks up from path looking for a .git entry instead of spawning git. Both
+    directories and files count, since worktrees and submodules use a .git file.
+    """
     if path is None:
         path = Path.cwd()
     
     if not path.is_dir():
         return False
 
-    try:
-        # Use git command to check if inside a work tree
-        subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            check=True,
-            capture_output=True,
-            cwd=path,
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    path = path.resolve()
+    return any((candidate / ".git").exists() for candidate in (path, *path.parents))
 
-def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Optional[str]]:
+def init_git_repo(project_path: Path, quiet: bool = False, *, paths: list[str] | None = None, timings: dict | None = None) -> Tuple[bool, Optional[str]]:
     """Initialize a git repository in the specified path.
     
     Args:
         project_path: Path to initialize git repository in
         quiet: if True suppress console output (tracker handles status)
+        paths: Project-relative files to stage for the initial commit; stages
+            the whole tree (`git add .`) when None
+        timings: Optional dict that receives the seconds spent in each phase
+            ("init", "add", "commit")
     
     Returns:
         Tuple of (success: bool, error_message: Optional[str])
     """
+    def run_phase(phase, cmd, **kwargs):
+        started = time.monotonic()
+        try:
+            return subprocess.run(cmd, capture_output=True, text=True, cwd=project_path, **kwargs)
+        finally:
+            if timings is not None:
+                timings[phase] = time.monotonic() - started
+
     try:
-        original_cwd = Path.cwd()
-        os.chdir(project_path)
         if not quiet:
             console.print("[cyan]正在初始化 Git 仓库...[/cyan]")
-        subprocess.run(["git", "init"], check=True, capture_output=True, text=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True, text=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True, text=True)
+        # Pass cwd instead of chdir so several repositories can be initialized concurrently
+        run_phase("init", ["git", "init"], check=True)
+        if paths is None:
+            run_phase("add", ["git", "add", "."], check=True)
+        elif paths:
+            # Stage only the template files, so a --here merge never walks or
+            # stages the rest of an existing directory
+            cmd = ["git", "-c", "advice.addIgnoredFile=false", "add", "--pathspec-from-file=-", "--pathspec-file-nul"]
+            result = run_phase("add", cmd, input="\0".join(paths), env={**os.environ, "GIT_LITERAL_PATHSPECS": "1"})
+            # Exit code 1 means some paths are .gitignore'd; they are skipped just like with `git add .`
+            if result.returncode not in (0, 1):
+                raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        run_phase("commit", ["git", "commit", "--allow-empty", "-m", "Initial commit from Specify template"], check=True)
         if not quiet:
             console.print("[green]✓[/green] Git 仓库已初始化")
         return True, None
@@ -564,18 +879,15 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Option
         if not quiet:
             console.print(f"[red]初始化 Git 仓库时出错：[/red] {e}")
         return False, error_msg
-    finally:
-        os.chdir(original_cwd)
 
-def handle_vscode_settings(sub_item, dest_file, rel_path, verbose=False, tracker=None) -> None:
-    """Handle merging or copying of .vscode/settings.json files."""
+def handle_vscode_settings(settings_data: bytes, dest_file: Path, rel_path, verbose=False, tracker=None) -> None:
+    """Handle merging or copying of .vscode/settings.json content from the template."""
     def log(message, color="green"):
         if verbose and not tracker:
             console.print(f"[{color}]{message}[/] {rel_path}")
 
     try:
-        with open(sub_item, 'r', encoding='utf-8') as f:
-            new_settings = json.load(f)
+        new_settings = json.loads(settings_data.decode('utf-8'))
 
         if dest_file.exists():
             merged = merge_json_files(dest_file, new_settings, verbose=verbose and not tracker)
@@ -584,12 +896,12 @@ def handle_vscode_settings(sub_item, dest_file, rel_path, verbose=False, tracker
                 f.write('\n')
             log("已合并：", "green")
         else:
-            shutil.copy2(sub_item, dest_file)
+            dest_file.write_bytes(settings_data)
             log("已复制（不存在 settings.json）：", "blue")
 
     except Exception as e:
         log(f"警告：无法合并，改为复制：{e}", "yellow")
-        shutil.copy2(sub_item, dest_file)
+        dest_file.write_bytes(settings_data)
 
 def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = False) -> dict:
     """Merge new JSON content into existing JSON file.
@@ -634,51 +946,609 @@ def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = Fal
 
     return merged
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Tuple[Path, dict]:
+def _cache_root() -> Path:
+    """Return the per-user cache directory used by the CLI."""
+    return Path(platformdirs.user_cache_dir("specify-cli", appauthor=False))
+
+def _sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class TemplateCache:
+    """Content-addressed on-disk cache for release template archives.
+
+    Archives are stored once per SHA-256 under ``blobs/`` and indexed by
+    ``<release tag>/<asset name>`` in ``index.json``, together with the size and
+    digest GitHub published for the asset. When the total size exceeds
+    ``max_bytes`` the least recently used entries are evicted. Interrupted
+    downloads are kept under ``partial/`` so a later run can resume them.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self.root = root or (_cache_root() / "templates")
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SPECIFY_CACHE_MAX_BYTES") or TEMPLATE_CACHE_MAX_BYTES)
+        self.max_bytes = max_bytes
+        self.blobs_dir = self.root / "blobs"
+        self.partial_dir = self.root / "partial"
+        self.index_path = self.root / "index.json"
+        self._lock = threading.RLock()  # index updates are read-modify-write
+
+    @staticmethod
+    def _key(tag: str, asset_name: str) -> str:
+        return f"{tag}/{asset_name}"
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self, index: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / f"{sha256}.zip"
+
+    def _touch(self, index: dict, key: str) -> Path | None:
+        """Verify an entry's blob and mark it as recently used. Drops corrupt entries."""
+        entry = index.get(key)
+        if not entry:
+            return None
+        blob = self._blob_path(entry["sha256"])
+        try:
+            if blob.stat().st_size != entry["size"] or _sha256_file(blob) != entry["sha256"]:
+                raise OSError("checksum mismatch")
+        except OSError:
+            index.pop(key, None)
+            self._save_index(index)
+            return None
+        entry["last_used"] = time.time()
+        self._save_index(index)
+        return blob
+
+    @staticmethod
+    def _matches_asset(entry: dict, asset: dict) -> bool:
+        """Return True if a cache entry holds exactly the bytes a release asset publishes."""
+        if asset.get("size") is not None and entry["size"] != asset["size"]:
+            return False
+        digest = asset.get("digest") or ""
+        if digest.startswith("sha256:") and entry["sha256"] != digest.split(":", 1)[1].lower():
+            return False
+        recorded = entry.get("digest")
+        return recorded is None or not asset.get("digest") or recorded == asset["digest"]
+
+    def lookup(self, tag: str, asset_name: str, *, asset: dict | None = None) -> Path | None:
+        """Return the cached archive for a release asset, or None on a miss.
+
+        When the release asset is given, an entry whose size or digest differs
+        from it (the asset was re-uploaded, or a bad download was stored) is a miss.
+        """
+        with self._lock:
+            index = self._load_index()
+            key = self._key(tag, asset_name)
+            if asset is not None and key in index and not self._matches_asset(index[key], asset):
+                return None
+            return self._touch(index, key)
+
+    def latest(self, pattern: str) -> Tuple[Path, dict] | None:
+        """Return the most recently stored archive whose asset name matches pattern."""
+        with self._lock:
+            index = self._load_index()
+            candidates = sorted(
+                (
+                    (key, entry) for key, entry in index.items()
+                    if pattern in entry["asset"] and entry["asset"].endswith(".zip")
+                ),
+                key=lambda item: item[1]["stored_at"],
+                reverse=True,
+            )
+            for key, entry in candidates:
+                blob = self._touch(index, key)
+                if blob is not None:
+                    return blob, entry
+            return None
+
+    def store(self, tag: str, asset_name: str, source: Path | BinaryIO, *, asset: dict | None = None) -> Path:
+        """Copy an archive (path or binary file object) into the cache and return the blob path.
+
+        Raises:
+            ValueError: If the archive does not match the given release asset
+        """
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.blobs_dir / f".{os.getpid()}-{threading.get_ident()}-{asset_name}.tmp"
+        digest = hashlib.sha256()
+        src = open(source, "rb") if isinstance(source, Path) else source
+        try:
+            with open(tmp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        finally:
+            if isinstance(source, Path):
+                src.close()
+            else:
+                source.seek(0)
+        sha256 = digest.hexdigest()
+        entry = {
+            "tag": tag,
+            "asset": asset_name,
+            "sha256": sha256,
+            "size": tmp_path.stat().st_size,
+            "digest": asset.get("digest") if asset else None,
+        }
+        if asset is not None and not self._matches_asset(entry, asset):
+            tmp_path.unlink()
+            raise ValueError(f"{asset_name} 与发布资源的大小或摘要不匹配，未写入缓存")
+        blob = self._blob_path(sha256)
+        if blob.exists():
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, blob)
+
+        now = time.time()
+        with self._lock:
+            index = self._load_index()
+            index[self._key(tag, asset_name)] = {
+                **entry,
+                "stored_at": now,
+                "last_used": now,
+            }
+            self._evict(index, keep=self._key(tag, asset_name))
+            self._save_index(index)
+        return blob
+
+    def partial_path(self, tag: str, asset_name: str) -> Path:
+        """Return the file an in-progress download of a release asset is written to."""
+        key_hash = hashlib.sha256(self._key(tag, asset_name).encode("utf-8")).hexdigest()[:16]
+        return self.partial_dir / f"{key_hash}-{asset_name}.part"
+
+    def open_partial(self, tag: str, asset_name: str) -> BinaryIO:
+        """Open the partial download of a release asset for appending, pruning stale ones."""
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = time.time() - PARTIAL_DOWNLOAD_MAX_AGE_SECONDS
+        for stale in self.partial_dir.glob("*.part"):
+            with contextlib.suppress(OSError):
+                if stale.stat().st_mtime < cutoff:
+                    stale.unlink()
+        return open(self.partial_path(tag, asset_name), "a+b")
+
+    def discard_partial(self, tag: str, asset_name: str) -> None:
+        self.partial_path(tag, asset_name).unlink(missing_ok=True)
+
+    def _evict(self, index: dict, keep: str | None = None) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        blob_sizes = {entry["sha256"]: entry["size"] for entry in index.values()}
+        total = sum(blob_sizes.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            del index[key]
+            sha256 = entry["sha256"]
+            if not any(e["sha256"] == sha256 for e in index.values()):
+                total -= blob_sizes[sha256]
+                self._blob_path(sha256).unlink(missing_ok=True)
+
+def _release_cache_path(api_url: str) -> Path:
+    """Return the file holding the last known release JSON and ETag for api_url."""
+    name = hashlib.sha256(api_url.encode("utf-8")).hexdigest()[:16]
+    return _cache_root() / "releases" / f"{name}.json"
+
+def _load_cached_release(api_url: str) -> dict | None:
+    try:
+        with open(_release_cache_path(api_url), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(cached, dict) or not cached.get("etag") or "release" not in cached:
+        return None
+    return cached
+
+def _save_cached_release(api_url: str, etag: str, release_data: dict) -> None:
+    cache_path = _release_cache_path(api_url)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"url": api_url, "etag": etag, "release": release_data}, f)
+    os.replace(tmp_path, cache_path)
+
+def fetch_latest_release(client: "httpx.Client", api_url: str, *, github_token: str = None, timeout: float = 30, debug: bool = False) -> dict:
+    """Fetch release JSON, revalidating the last known copy with If-None-Match.
+
+    GitHub does not count 304 Not Modified responses against the rate limit, so
+    repeated lookups of an unchanged release are free.
+
+    Raises:
+        RuntimeError: On non-success status codes or malformed JSON
+    """
+    cached = _load_cached_release(api_url)
+    headers = _github_auth_headers(github_token)
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+
+    response = client.get(
+        api_url,
+        timeout=timeout,
+        follow_redirects=True,
+        headers=headers,
+    )
+    status = response.status_code
+    if status == 304 and cached:
+        return cached["release"]
+    if status != 200:
+        # Format detailed error message with rate-limit info
+        error_msg = _format_rate_limit_error(status, response.headers, api_url)
+        if debug:
+            error_msg += f"\n\n[dim]响应体（截取 500 字符）：[/dim]\n{response.text[:500]}"
+        raise RuntimeError(error_msg)
+    try:
+        release_data = response.json()
+    except ValueError as je:
+        raise RuntimeError(f"解析发布 JSON 失败：{je}\n原始内容（截取 400 字符）：{response.text[:400]}")
+
+    etag = response.headers.get("ETag")
+    if etag:
+        try:
+            _save_cached_release(api_url, etag, release_data)
+        except OSError:
+            pass
+    return release_data
+
+def select_template_asset(release_data: dict, ai_assistant: str, script_type: str) -> dict | None:
+    """Return the release asset holding the template for an AI assistant and script type."""
+    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
+    for asset in release_data.get("assets", []):
+        if pattern in asset["name"] and asset["name"].endswith(".zip"):
+            return asset
+    return None
+
+class _TransientDownloadError(Exception):
+    """A download attempt failed in a way that is worth retrying."""
+
+def _verify_download(f: BinaryIO, asset: dict) -> None:
+    """Check a downloaded asset against the size and digest published by GitHub.
+
+    Raises:
+        RuntimeError: If the size or SHA-256 digest does not match
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    expected_size = asset.get("size")
+    if expected_size is not None and size != expected_size:
+        raise RuntimeError(f"下载大小不匹配：期望 {expected_size:,} 字节，实际 {size:,} 字节")
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        f.seek(0)
+        actual = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            actual.update(chunk)
+        if actual.hexdigest() != digest.split(":", 1)[1].lower():
+            raise RuntimeError(f"下载校验失败：SHA-256 与发布摘要不匹配（{digest}）")
+
+def _range_validator(headers: "httpx.Headers") -> str | None:
+    """Return a validator from a download response that is usable in If-Range."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+def _next_download_request(f: BinaryIO, asset: dict, github_token: str = None, validator: str | None = None) -> Tuple[int, dict | None]:
+    """Return the offset and request headers for the next download attempt.
+
+    The headers are None when f already holds the whole asset. Bytes already in
+    f are resumed with If-Range when an earlier response of this download gave
+    a validator. Bytes without one (left by an earlier run) are only resumed
+    when GitHub publishes a digest that would catch a splice of two different
+    uploads; otherwise the download starts over.
+    """
+    expected_size = asset.get("size") or 0
+    f.seek(0, os.SEEK_END)
+    offset = f.tell()
+    if offset and validator is None and not (asset.get("digest") or "").startswith("sha256:"):
+        f.seek(0)
+        f.truncate()
+        offset = 0
+    if expected_size and offset >= expected_size:
+        if offset == expected_size:
+            return offset, None  # Already complete from an earlier attempt or run
+        f.seek(0)
+        f.truncate()
+        offset = 0
+
+    headers = _github_auth_headers(github_token)
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if validator:
+            # The server sends the whole file instead of the range if it changed since
+            headers["If-Range"] = validator
+    return offset, headers
+
+def _accept_download_response(f: BinaryIO, offset: int, status: int) -> bool:
+    """Prepare f for a response body. Returns False when the status is an error.
+
+    Raises:
+        _TransientDownloadError: If the server rejected the resume range
+    """
+    if status == 200 and offset:
+        # Server ignored the Range header and sent the whole file
+        f.seek(0)
+        f.truncate()
+    elif status == 416 and offset:
+        # Partial data no longer matches the remote file; start over
+        f.seek(0)
+        f.truncate()
+        raise _TransientDownloadError("服务器拒绝续传范围，重新开始下载")
+    return status in (200, 206)
+
+def _download_status_error(response: "httpx.Response", url: str, body: bytes | None = None) -> Exception:
+    """Build the error for a failed download response, retryable when the status is transient."""
+    # Handle rate-limiting on download as well
+    error_msg = _format_rate_limit_error(response.status_code, response.headers, url)
+    if body is not None:
+        error_msg += f"\n\n[dim]响应体（截取 400 字符）：[/dim]\n{body[:400].decode('utf-8', 'replace')}"
+    if response.status_code in DOWNLOAD_RETRY_STATUS_CODES:
+        return _TransientDownloadError(error_msg)
+    return RuntimeError(error_msg)
+
+def _check_download_complete(f: BinaryIO, asset: dict) -> None:
+    """Raise _TransientDownloadError if the connection closed before the whole asset arrived."""
+    expected_size = asset.get("size") or 0
+    if expected_size and f.tell() < expected_size:
+        raise _TransientDownloadError(f"连接提前结束（已接收 {f.tell():,}/{expected_size:,} 字节）")
+
+def download_release_asset(client: "httpx.Client", asset: dict, f: BinaryIO, *, github_token: str = None, debug: bool = False, show_progress: bool = False, max_attempts: int = DOWNLOAD_MAX_ATTEMPTS) -> int:
+    """Stream a release asset into a seekable binary file object.
+
+    Bytes already present in f are kept: the first request and every retry ask
+    only for the missing tail with an HTTP Range header (see
+    _next_download_request for when that is safe), backing off exponentially
+    between attempts. The finished file is verified against the
+    asset's size and, when GitHub publishes one, its SHA-256 digest.
+
+    Returns:
+        Number of bytes received over the network (0 if f was already complete)
+
+    Raises:
+        RuntimeError: On non-retryable HTTP errors, exhausted retries or failed verification
+    """
+    import httpx
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    download_url = asset["browser_download_url"]
+    expected_size = asset.get("size") or 0
+
+    progress_cm = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        console=console,
+    ) if show_progress and expected_size else contextlib.nullcontext()
+
+    with progress_cm as progress:
+        task = progress.add_task("正在下载...", total=expected_size) if progress else None
+        received = 0
+        attempt = 0
+        validator = None
+        while True:
+            attempt += 1
+            offset, headers = _next_download_request(f, asset, github_token, validator)
+            if headers is None:
+                break
+            try:
+                with client.stream(
+                    "GET",
+                    download_url,
+                    timeout=60,
+                    follow_redirects=True,
+                    headers=headers,
+                ) as response:
+                    if not _accept_download_response(f, offset, response.status_code):
+                        raise _download_status_error(response, download_url, response.read() if debug else None)
+                    validator = _range_validator(response.headers) or validator
+                    for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        received += len(chunk)
+                        if progress:
+                            progress.update(task, completed=f.tell())
+                _check_download_complete(f, asset)
+                break
+            except (httpx.TransportError, _TransientDownloadError) as e:
+                if attempt >= max_attempts:
+                    raise RuntimeError(f"下载失败（已尝试 {attempt} 次）：{e}") from e
+                time.sleep(DOWNLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+    _verify_download(f, asset)
+    return received
+
+async def download_release_asset_async(client: "httpx.AsyncClient", asset: dict, f: BinaryIO, *, github_token: str = None, debug: bool = False, max_attempts: int = DOWNLOAD_MAX_ATTEMPTS) -> int:
+    """Async counterpart of download_release_asset, with the same resume, retry and verification rules.
+
+    Raises:
+        RuntimeError: On non-retryable HTTP errors, exhausted retries or failed verification
+    """
+    import asyncio
+    import httpx
+
+    download_url = asset["browser_download_url"]
+    received = 0
+    attempt = 0
+    validator = None
+    while True:
+        attempt += 1
+        offset, headers = _next_download_request(f, asset, github_token, validator)
+        if headers is None:
+            break
+        try:
+            async with client.stream(
+                "GET",
+                download_url,
+                timeout=60,
+                follow_redirects=True,
+                headers=headers,
+            ) as response:
+                if not _accept_download_response(f, offset, response.status_code):
+                    raise _download_status_error(response, download_url, await response.aread() if debug else None)
+                validator = _range_validator(response.headers) or validator
+                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+            _check_download_complete(f, asset)
+            break
+        except (httpx.TransportError, _TransientDownloadError) as e:
+            if attempt >= max_attempts:
+                raise RuntimeError(f"下载失败（已尝试 {attempt} 次）：{e}") from e
+            await asyncio.sleep(DOWNLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+    await asyncio.to_thread(_verify_download, f, asset)
+    return received
+
+def _open_asset_download(cache: TemplateCache, tag: str, asset: dict) -> BinaryIO:
+    """Open the file a release asset is downloaded into.
+
+    Downloads land in the cache's partial file for the tag and asset, so a rerun
+    resumes where an interrupted one stopped. When the cache directory is not
+    writable the download goes to an in-memory spool instead.
+    """
+    try:
+        return cache.open_partial(tag, asset["name"])
+    except OSError:
+        return tempfile.SpooledTemporaryFile(max_size=TEMPLATE_SPOOL_MAX_BYTES)
+
+def _abandon_asset_download(cache: TemplateCache, tag: str, asset: dict, f: BinaryIO) -> str:
+    """Close f after a failed download. Returns a hint when the partial file is kept for resuming."""
+    f.seek(0, os.SEEK_END)
+    partial_size = f.tell()
+    f.close()
+    if isinstance(f, tempfile.SpooledTemporaryFile):
+        return ""
+    expected_size = asset.get("size") or 0
+    # Only a published digest makes a partial file safe to resume in a later run
+    if 0 < partial_size < expected_size and (asset.get("digest") or "").startswith("sha256:"):
+        return f"\n\n[dim]已保留部分下载（{partial_size:,}/{expected_size:,} 字节），重新运行将从断点继续：{cache.partial_path(tag, asset['name'])}[/dim]"
+    with contextlib.suppress(OSError):
+        cache.discard_partial(tag, asset["name"])
+    return ""
+
+def _finish_asset_download(cache: TemplateCache, tag: str, asset: dict, f: BinaryIO) -> Path | BinaryIO:
+    """Move a verified download into the cache and return the blob path.
+
+    If the cache cannot be written, f is returned rewound instead and the
+    caller must close it.
+    """
+    f.seek(0)
+    try:
+        blob = cache.store(tag, asset["name"], f, asset=asset)
+    except (OSError, ValueError):
+        f.seek(0)
+        return f
+    f.close()
+    with contextlib.suppress(OSError):
+        cache.discard_partial(tag, asset["name"])
+    return blob
+
+def download_release_asset_to_cache(client: "httpx.Client", cache: TemplateCache, tag: str, asset: dict, *, github_token: str = None, debug: bool = False, show_progress: bool = False) -> Tuple[Path | BinaryIO, int]:
+    """Download a release asset into the template cache, resuming an interrupted earlier run.
+
+    Returns the cached archive path, or a rewound file object holding the
+    archive (which the caller must close) when the cache cannot be written,
+    plus the number of bytes received over the network.
+
+    Raises:
+        RuntimeError: If the download fails; the message says when the partial download is kept
+    """
+    f = _open_asset_download(cache, tag, asset)
+    try:
+        received = download_release_asset(client, asset, f, github_token=github_token, debug=debug, show_progress=show_progress)
+    except Exception as e:
+        raise RuntimeError(f"{e}{_abandon_asset_download(cache, tag, asset, f)}") from e
+    return _finish_asset_download(cache, tag, asset, f), received
+
+async def download_release_asset_to_cache_async(client: "httpx.AsyncClient", cache: TemplateCache, tag: str, asset: dict, *, github_token: str = None, debug: bool = False) -> Tuple[Path, int]:
+    """Async counterpart of download_release_asset_to_cache that requires a writable cache.
+
+    Raises:
+        RuntimeError: If the download fails or the archive cannot be stored in the cache
+    """
+    import asyncio
+
+    f = _open_asset_download(cache, tag, asset)
+    try:
+        received = await download_release_asset_async(client, asset, f, github_token=github_token, debug=debug)
+    except Exception as e:
+        raise RuntimeError(f"{e}{_abandon_asset_download(cache, tag, asset, f)}") from e
+    source = await asyncio.to_thread(_finish_asset_download, cache, tag, asset, f)
+    if not isinstance(source, Path):
+        source.close()
+        raise RuntimeError(f"无法写入模板缓存：{cache.root}")
+    return source, received
+
+def download_template_from_github(ai_assistant: str, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: "httpx.Client" = None, debug: bool = False, github_token: str = None, cache: TemplateCache | None = None, offline: bool = False) -> Tuple[Path | BinaryIO, dict]:
+    """Fetch the template archive for an AI assistant and script type.
+
+    Nothing is written to the working directory. Downloads go through the
+    template cache (resuming an interrupted earlier run) and the cached archive
+    is returned by path; if the cache cannot be written, a file object holding
+    the archive is returned instead and the caller must close it.
+    """
     repo_owner = "renhongliang"
     repo_name = "spec-kit-chinese"
+    if cache is None:
+        cache = TemplateCache()
+    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
+
+    if offline:
+        cached = cache.latest(pattern)
+        if cached is None:
+            console.print(f"[red]离线模式：缓存中没有匹配的模板[/red]（期望模式：[bold]{pattern}[/bold]）")
+            console.print(f"[dim]缓存目录：{cache.root}[/dim]")
+            raise typer.Exit(1)
+        blob, entry = cached
+        if verbose:
+            console.print(f"[cyan]离线模式：使用缓存模板[/cyan] {entry['asset']}（{entry['tag']}）")
+        metadata = {
+            "filename": entry["asset"],
+            "size": entry["size"],
+            "release": entry["tag"],
+            "asset_url": None,
+            "cached": True,
+            "release_fetched_at": time.monotonic(),
+            "downloaded_bytes": 0,
+        }
+        return blob, metadata
+
     if client is None:
-        client = httpx.Client(verify=ssl_context)
+        import httpx
+        with httpx.Client(verify=_get_ssl_context()) as own_client:
+            return download_template_from_github(ai_assistant, script_type=script_type, verbose=verbose, show_progress=show_progress, client=own_client, debug=debug, github_token=github_token, cache=cache)
 
     if verbose:
         console.print("[cyan]正在获取最新发布信息...[/cyan]")
     api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
 
     try:
-        response = client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            # Format detailed error message with rate-limit info
-            error_msg = _format_rate_limit_error(status, response.headers, api_url)
-                if debug:
-                    error_msg += f"\n\n[dim]响应体（截取 500 字符）：[/dim]\n{response.text[:500]}"
-            raise RuntimeError(error_msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"解析发布 JSON 失败：{je}\n原始内容（截取 400 字符）：{response.text[:400]}")
+        release_data = fetch_latest_release(client, api_url, github_token=github_token, debug=debug)
     except Exception as e:
-        console.print(f"[red]获取发布信息时出错[/red]")
+        console.print("[red]获取发布信息时出错[/red]")
         console.print(Panel(str(e), title="获取错误", border_style="red"))
         raise typer.Exit(1)
 
-    assets = release_data.get("assets", [])
-    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
-    matching_assets = [
-        asset for asset in assets
-        if pattern in asset["name"] and asset["name"].endswith(".zip")
-    ]
-
-    asset = matching_assets[0] if matching_assets else None
+    asset = select_template_asset(release_data, ai_assistant, script_type)
 
     if asset is None:
         console.print(f"[red]未找到匹配的发布资源[/red] [bold]{ai_assistant}[/bold]（期望模式：[bold]{pattern}[/bold]）")
-        asset_names = [a.get('name', '?') for a in assets]
+        asset_names = [a.get('name', '?') for a in release_data.get("assets", [])]
         console.print(Panel("\n".join(asset_names) or "(无资源)", title="可用资源", border_style="yellow"))
         raise typer.Exit(1)
 
@@ -691,86 +1561,281 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
         console.print(f"[cyan]大小：[/cyan] {file_size:,} 字节")
         console.print(f"[cyan]发布版本：[/cyan] {release_data['tag_name']}")
 
-    zip_path = download_dir / filename
+    metadata = {
+        "filename": filename,
+        "size": file_size,
+        "release": release_data["tag_name"],
+        "asset_url": download_url,
+        "cached": False,
+        # Lets callers split release lookup latency from download time
+        "release_fetched_at": time.monotonic(),
+        "downloaded_bytes": 0,
+    }
+
+    cached_blob = cache.lookup(release_data["tag_name"], filename, asset=asset)
+    if cached_blob is not None:
+        if verbose:
+            console.print(f"[cyan]使用缓存模板：[/cyan] {cached_blob}")
+        metadata["cached"] = True
+        return cached_blob, metadata
+
     if verbose:
-        console.print(f"[cyan]正在下载模板...[/cyan]")
+        console.print("[cyan]正在下载模板...[/cyan]")
 
     try:
-        with client.stream(
-            "GET",
-            download_url,
-            timeout=60,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        ) as response:
-            if response.status_code != 200:
-                # Handle rate-limiting on download as well
-                error_msg = _format_rate_limit_error(response.status_code, response.headers, download_url)
-                if debug:
-                    error_msg += f"\n\n[dim]响应体（截取 400 字符）：[/dim]\n{response.text[:400]}"
-                raise RuntimeError(error_msg)
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("正在下载...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
-    except Exception as e:
-        console.print(f"[red]下载模板时出错[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="下载错误", border_style="red"))
+        zip_source, received = download_release_asset_to_cache(client, cache, release_data["tag_name"], asset, github_token=github_token, debug=debug, show_progress=show_progress)
+    except RuntimeError as e:
+        console.print("[red]下载模板时出错[/red]")
+        console.print(Panel(str(e), title="下载错误", border_style="red"))
         raise typer.Exit(1)
     if verbose:
         console.print(f"已下载：{filename}")
-    metadata = {
-        "filename": filename,
-        "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
+    metadata["downloaded_bytes"] = received
+    if debug and not isinstance(zip_source, Path):
+        console.print(f"[yellow]无法写入模板缓存：[/yellow] {cache.root}")
+    return zip_source, metadata
+
+def _archive_root_prefix(infos: list[zipfile.ZipInfo]) -> str:
+    """Return the single top-level directory wrapping every archive entry, or ''."""
+    prefixes = set()
+    for info in infos:
+        head, sep, _ = info.filename.partition("/")
+        if not sep:
+            return ""  # A top-level file means there is nothing to flatten
+        prefixes.add(head)
+        if len(prefixes) > 1:
+            return ""
+    return f"{prefixes.pop()}/" if prefixes else ""
+
+def _executable_mode(mode: int) -> int:
+    """Add execute bits wherever the mode grants read access (always for the owner)."""
+    new_mode = mode
+    if mode & 0o400: new_mode |= 0o100
+    if mode & 0o040: new_mode |= 0o010
+    if mode & 0o004: new_mode |= 0o001
+    return new_mode | 0o100
+
+def _is_executable_member(info: zipfile.ZipInfo, rel_path: str, head: bytes) -> bool:
+    """Decide whether an extracted member should be executable.
+
+    Unix-built archives carry the mode in the upper half of external_attr;
+    otherwise fall back to `.specify/scripts/**/*.sh` files with a shebang.
+    """
+    if info.create_system == 3 and (info.external_attr >> 16) & 0o111:
+        return True
+    return rel_path.startswith(".specify/scripts/") and rel_path.endswith(".sh") and head.startswith(b"#!")
+
+def _copy_archive_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: Path, rel_path: str) -> Tuple[str, bool]:
+    """Stream one archive member to dest_path, setting execute bits as it is written.
+
+    Returns:
+        Tuple of (SHA-256 of the content, whether execute bits were added)
+    """
+    digest = hashlib.sha256()
+    chmodded = False
+    with zip_ref.open(info) as src, open(dest_path, "wb") as dst:
+        head = b""
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            if not head:
+                head = chunk[:2]
+            digest.update(chunk)
+            dst.write(chunk)
+        if os.name != "nt" and _is_executable_member(info, rel_path, head):
+            mode = os.fstat(dst.fileno()).st_mode & 0o7777
+            if not mode & 0o111:
+                os.fchmod(dst.fileno(), _executable_mode(mode))
+                chmodded = True
+    return digest.hexdigest(), chmodded
+
+def _hash_archive_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+    """Return the SHA-256 of an archive member's content without extracting it."""
+    digest = hashlib.sha256()
+    with zip_ref.open(info) as src:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _iter_archive_files(zip_ref: zipfile.ZipFile, project_path: Path):
+    """Yield (info, rel_path, dest_path) for each file member, flattening a wrapping directory.
+
+    Directory members are created as they are seen. Raises RuntimeError for
+    entries that would land outside project_path.
+    """
+    infos = zip_ref.infolist()
+    prefix = _archive_root_prefix(infos)
+    root = project_path.resolve()
+    for info in infos:
+        rel_path = info.filename[len(prefix):]
+        if not rel_path:
+            continue
+        dest_path = project_path / rel_path
+        if not dest_path.resolve().is_relative_to(root):
+            raise RuntimeError(f"归档条目越出目标目录：{info.filename}")
+        if info.is_dir():
+            dest_path.mkdir(parents=True, exist_ok=True)
+            continue
+        yield info, rel_path.rstrip("/"), dest_path
+
+def extract_template_archive(zip_ref: zipfile.ZipFile, project_path: Path, *, merge: bool = False, verbose: bool = False, tracker: StepTracker | None = None, hashes: dict | None = None, executables: list | None = None) -> list[str]:
+    """Stream template archive members straight to their final paths under project_path.
+
+    A single wrapping top-level directory is flattened while extracting, and when
+    merging into an existing directory `.vscode/settings.json` is deep-merged
+    instead of overwritten. Scripts get their execute bits as they are written
+    (see _is_executable_member). Returns the written files as POSIX paths
+    relative to project_path; when `hashes` is given it also receives the
+    SHA-256 of each file's template content, keyed by the same paths, and
+    `executables` receives the files whose execute bits were added.
+    """
+    if _archive_root_prefix(zip_ref.infolist()):
+        if tracker:
+            tracker.add("flatten", "展平嵌套目录")
+            tracker.complete("flatten")
+        elif verbose:
+            console.print("[cyan]发现嵌套目录结构[/cyan]")
+
+    written: list[str] = []
+    for info, rel_path, dest_path in _iter_archive_files(zip_ref, project_path):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        if merge and rel_path == ".vscode/settings.json":
+            data = zip_ref.read(info)
+            handle_vscode_settings(data, dest_path, rel_path, verbose, tracker)
+            digest = hashlib.sha256(data).hexdigest()
+        else:
+            if merge and verbose and not tracker and "/" not in rel_path and dest_path.exists():
+                console.print(f"[yellow]正在覆盖文件：[/yellow] {rel_path}")
+            digest, chmodded = _copy_archive_member(zip_ref, info, dest_path, rel_path)
+            if chmodded and executables is not None:
+                executables.append(rel_path)
+        if hashes is not None:
+            hashes[rel_path] = digest
+        written.append(rel_path)
+    return written
+
+def load_template_manifest(project_path: Path) -> dict | None:
+    """Return the project's template manifest, or None if missing or unreadable."""
+    try:
+        manifest = json.loads((project_path / TEMPLATE_MANIFEST_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) and isinstance(manifest.get("files"), dict) else None
+
+def write_template_manifest(project_path: Path, hashes: dict, *, release: str, ai_assistant: str, script_type: str) -> str:
+    """Record the installed template files and their hashes. Returns the manifest's relative path."""
+    manifest = {
+        "release": release,
+        "ai": ai_assistant,
+        "script": script_type,
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": dict(sorted(hashes.items())),
     }
-    return zip_path, metadata
+    manifest_path = project_path / TEMPLATE_MANIFEST_PATH
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, manifest_path)
+    return TEMPLATE_MANIFEST_PATH
+
+def upgrade_template_archive(zip_ref: zipfile.ZipFile, project_path: Path, installed: dict, *, force: bool = False, dry_run: bool = False) -> dict:
+    """Apply a new template archive to an existing project, writing only changed files.
+
+    `installed` maps relative paths to the template hashes recorded at the last
+    install. A file is rewritten only when the template content changed and the
+    copy on disk still matches the old template (or `force` is set); files the
+    user edited are reported as conflicts and left alone. Files dropped from
+    the template are deleted when unmodified. Unchanged files are never opened
+    for writing, so their mtimes are preserved.
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Path:
-    """Download the latest release and extract it to create a new project.
-    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    Returns:
+        Dict with lists "added", "updated", "removed", "conflicts", "kept" and
+        "unchanged", plus "hashes": the file hashes for the new manifest
     """
-    current_dir = Path.cwd()
+    result = {"added": [], "updated": [], "removed": [], "conflicts": [], "kept": [], "unchanged": [], "hashes": {}}
+
+    def disk_hash(path: Path) -> str | None:
+        try:
+            return _sha256_file(path)
+        except OSError:
+            return None
+
+    for info, rel_path, dest_path in _iter_archive_files(zip_ref, project_path):
+        new_hash = _hash_archive_member(zip_ref, info)
+        old_hash = installed.get(rel_path)
+        result["hashes"][rel_path] = new_hash
+        if new_hash == old_hash:
+            # Template content unchanged: leave the file (or its deliberate removal) alone
+            result["unchanged"].append(rel_path)
+            continue
+
+        exists = dest_path.exists()
+        if rel_path == ".vscode/settings.json":
+            # Always deep-merged into the user's settings, never overwritten
+            action = "updated" if exists else "added"
+        elif not exists:
+            action = "added"
+        else:
+            current = disk_hash(dest_path)
+            if current == new_hash:
+                result["unchanged"].append(rel_path)
+                continue
+            if current != old_hash and not force:
+                result["conflicts"].append(rel_path)
+                if old_hash is not None:
+                    # Keep comparing against the old template until the user resolves it
+                    result["hashes"][rel_path] = old_hash
+                else:
+                    del result["hashes"][rel_path]
+                continue
+            action = "updated"
+
+        if not dry_run:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            if rel_path == ".vscode/settings.json":
+                handle_vscode_settings(zip_ref.read(info), dest_path, rel_path)
+            else:
+                _copy_archive_member(zip_ref, info, dest_path, rel_path)
+        result[action].append(rel_path)
+
+    for rel_path, old_hash in installed.items():
+        if rel_path in result["hashes"] or rel_path in result["conflicts"]:
+            continue
+        dest_path = project_path / rel_path
+        if not dest_path.exists():
+            continue
+        if disk_hash(dest_path) == old_hash or force:
+            if not dry_run:
+                dest_path.unlink()
+            result["removed"].append(rel_path)
+        else:
+            result["kept"].append(rel_path)
+
+    return result
 
+def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: "httpx.Client" = None, debug: bool = False, github_token: str = None, offline: bool = False) -> list[str]:
+    """Download the latest release and extract it to create a new project.
+    Returns the project-relative paths written from the template. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    """
     if tracker:
-        tracker.start("fetch", "正在联系 GitHub API")
+        tracker.start("fetch", "正在读取本地缓存" if offline else "正在联系 GitHub API")
     try:
-        zip_path, meta = download_template_from_github(
+        zip_source, meta = download_template_from_github(
             ai_assistant,
-            current_dir,
             script_type=script_type,
             verbose=verbose and tracker is None,
             show_progress=(tracker is None),
             client=client,
             debug=debug,
-            github_token=github_token
+            github_token=github_token,
+            offline=offline,
         )
         if tracker:
             tracker.complete("fetch", f"发布版本 {meta['release']} ({meta['size']:,} 字节)")
+            tracker.record("fetch", ended=meta["release_fetched_at"])
             tracker.add("download", "下载模板")
-            tracker.complete("download", meta['filename'])
+            tracker.complete("download", f"{meta['filename']}（缓存）" if meta["cached"] else meta['filename'])
+            tracker.record("download", started=meta["release_fetched_at"], nbytes=meta["downloaded_bytes"])
     except Exception as e:
         if tracker:
             tracker.error("fetch", str(e))
@@ -789,7 +1854,7 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
         if not is_current_dir:
             project_path.mkdir(parents=True)
 
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
             zip_contents = zip_ref.namelist()
             if tracker:
                 tracker.start("zip-list")
@@ -797,77 +1862,26 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             elif verbose:
                 console.print(f"[cyan]ZIP 包含 {len(zip_contents)} 个项目[/cyan]")
 
-            if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
-
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"临时 {len(extracted_items)} 个项目")
-                    elif verbose:
-                        console.print(f"[cyan]已提取 {len(extracted_items)} 个项目到临时位置[/cyan]")
-
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "展平嵌套目录")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]发现嵌套目录结构[/cyan]")
-
-                    for item in source_dir.iterdir():
-                        dest_path = project_path / item.name
-                        if item.is_dir():
-                            if dest_path.exists():
-                                if verbose and not tracker:
-                                    console.print(f"[yellow]正在合并目录：[/yellow] {item.name}")
-                                for sub_item in item.rglob('*'):
-                                    if sub_item.is_file():
-                                        rel_path = sub_item.relative_to(item)
-                                        dest_file = dest_path / rel_path
-                                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                                        # Special handling for .vscode/settings.json - merge instead of overwrite
-                                        if dest_file.name == "settings.json" and dest_file.parent.name == ".vscode":
-                                            handle_vscode_settings(sub_item, dest_file, rel_path, verbose, tracker)
-                                        else:
-                                            shutil.copy2(sub_item, dest_file)
-                            else:
-                                shutil.copytree(item, dest_path)
-                        else:
-                            if dest_path.exists() and verbose and not tracker:
-                                console.print(f"[yellow]正在覆盖文件：[/yellow] {item.name}")
-                            shutil.copy2(item, dest_path)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]模板文件已合并到当前目录[/cyan]")
-            else:
-                zip_ref.extractall(project_path)
-
-                extracted_items = list(project_path.iterdir())
-                if tracker:
-                    tracker.start("extracted-summary")
-                    tracker.complete("extracted-summary", f"{len(extracted_items)} 个顶级项目")
-                elif verbose:
-                    console.print(f"[cyan]已提取 {len(extracted_items)} 个项目到 {project_path}：[/cyan]")
-                    for item in extracted_items:
-                        console.print(f"  - {item.name} ({'目录' if item.is_dir() else '文件'})")
-
-                if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                    nested_dir = extracted_items[0]
-                    temp_move_dir = project_path.parent / f"{project_path.name}_temp"
-
-                    shutil.move(str(nested_dir), str(temp_move_dir))
+            hashes = {}
+            executables = []
+            written = extract_template_archive(zip_ref, project_path, merge=is_current_dir, verbose=verbose, tracker=tracker, hashes=hashes, executables=executables)
+            written.append(write_template_manifest(project_path, hashes, release=meta["release"], ai_assistant=ai_assistant, script_type=script_type))
 
-                    project_path.rmdir()
-
-                    shutil.move(str(temp_move_dir), str(project_path))
-                    if tracker:
-                        tracker.add("flatten", "展平嵌套目录")
-                        tracker.complete("flatten")
-                    elif verbose:
-                        console.print(f"[cyan]已展平嵌套目录结构[/cyan]")
+            top_level = {rel.split("/", 1)[0] for rel in hashes}
+            if tracker:
+                tracker.record("extract", nbytes=sum(info.file_size for info in zip_ref.infolist() if not info.is_dir()))
+                tracker.start("extracted-summary")
+                tracker.complete("extracted-summary", f"{len(hashes)} 个文件，{len(top_level)} 个顶级项目")
+                if os.name == "nt":
+                    tracker.skip("chmod", "Windows 无需设置")
+                else:
+                    tracker.complete("chmod", f"{len(executables)} 个已更新")
+            elif verbose:
+                console.print(f"[cyan]已提取 {len(hashes)} 个文件到 {project_path}：[/cyan]")
+                for name in sorted(top_level):
+                    console.print(f"  - {name}")
+                if is_current_dir:
+                    console.print("[cyan]模板文件已合并到当前目录[/cyan]")
 
     except Exception as e:
         if tracker:
@@ -886,61 +1900,29 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             tracker.complete("extract")
     finally:
         if tracker:
-            tracker.add("cleanup", "删除临时归档")
+            tracker.add("cleanup", "释放下载缓冲区")
+            tracker.start("cleanup")
 
-        if zip_path.exists():
-            zip_path.unlink()
-            if tracker:
-                tracker.complete("cleanup")
-            elif verbose:
-                console.print(f"已清理：{zip_path.name}")
+        # Cached archives are read in place; only the download buffer needs releasing
+        if not isinstance(zip_source, Path):
+            zip_source.close()
+        if tracker:
+            tracker.complete("cleanup")
 
-    return project_path
+    return written
 
 
-def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None = None) -> None:
-    """Ensure POSIX .sh scripts under .specify/scripts (recursively) have execute bits (no-op on Windows)."""
-    if os.name == "nt":
-        return  # Windows: skip silently
-    scripts_root = project_path / ".specify" / "scripts"
-    if not scripts_root.is_dir():
-        return
-    failures: list[str] = []
-    updated = 0
-    for script in scripts_root.rglob("*.sh"):
+def _emit_step_timings(tracker: StepTracker, show_table: bool, trace_file: Path | None) -> None:
+    """Print the timings table and/or write the Chrome trace file requested on the command line."""
+    if show_table:
+        console.print()
+        console.print(tracker.timings_table())
+    if trace_file:
         try:
-            if script.is_symlink() or not script.is_file():
-                continue
-            try:
-                with script.open("rb") as f:
-                    if f.read(2) != b"#!":
-                        continue
-            except Exception:
-                continue
-            st = script.stat(); mode = st.st_mode
-            if mode & 0o111:
-                continue
-            new_mode = mode
-            if mode & 0o400: new_mode |= 0o100
-            if mode & 0o040: new_mode |= 0o010
-            if mode & 0o004: new_mode |= 0o001
-            if not (new_mode & 0o100):
-                new_mode |= 0o100
-            os.chmod(script, new_mode)
-            updated += 1
-        except Exception as e:
-            failures.append(f"{script.relative_to(scripts_root)}: {e}")
-    if tracker:
-        detail = f"{updated} 个已更新" + (f"，{len(failures)} 个失败" if failures else "")
-        tracker.add("chmod", "递归设置脚本权限")
-        (tracker.error if failures else tracker.complete)("chmod", detail)
-    else:
-        if updated:
-            console.print(f"[cyan]已递归更新 {updated} 个脚本的执行权限[/cyan]")
-        if failures:
-            console.print("[yellow]部分脚本无法更新：[/yellow]")
-            for f in failures:
-                console.print(f"  - {f}")
+            trace_file.write_text(json.dumps(tracker.trace_events(), ensure_ascii=False, indent=2), encoding="utf-8")
+            console.print(f"[dim]已写入追踪文件：{trace_file}[/dim]")
+        except OSError as e:
+            console.print(f"[yellow]无法写入追踪文件：[/yellow] {e}")
 
 @app.command()
 def init(
@@ -954,6 +1936,9 @@ def init(
     skip_tls: bool = typer.Option(False, "--skip-tls", help="跳过 SSL/TLS 验证（不推荐）"),
     debug: bool = typer.Option(False, "--debug", help="显示网络和解压失败的详细诊断输出"),
     github_token: str = typer.Option(None, "--github-token", help="用于 API 请求的 GitHub token（或设置 GH_TOKEN 或 GITHUB_TOKEN 环境变量）"),
+    offline: bool = typer.Option(False, "--offline", help="仅使用本地模板缓存，不访问网络"),
+    timings: bool = typer.Option(False, "--timings", help="完成后显示每个步骤的耗时和传输字节数"),
+    trace_file: Path = typer.Option(None, "--trace-file", help="将步骤耗时写入 Chrome trace-event JSON 文件（可在 chrome://tracing 或 Perfetto 中查看）"),
 ):
     """
     从最新模板初始化一个新的 Specify 项目。
@@ -978,7 +1963,11 @@ def init(
         specify init --here --ai codebuddy
         specify init --here
         specify init --here --force  # 当前目录非空时跳过确认
+        specify init my-project --ai claude --offline  # 使用本地缓存的模板
+        specify init my-project --ai claude --timings --trace-file init-trace.json
     """
+    from rich.live import Live
+
 
     show_banner()
 
@@ -1117,25 +2106,27 @@ def init(
     # Track git error message outside Live context so it persists
     git_error_message = None
 
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    with Live(tracker, console=console, refresh_per_second=8, transient=True) as live:
+        tracker.attach_refresh(live.refresh)
+        local_client = None
         try:
-            verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
-            local_client = httpx.Client(verify=local_ssl_context)
-
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token)
+            if not offline:
+                # --offline runs never touch the network, so they skip importing httpx and truststore
+                import httpx
+                local_client = httpx.Client(verify=_get_ssl_context() if not skip_tls else False)
 
-            ensure_executable_scripts(project_path, tracker=tracker)
+            written = download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, offline=offline)
 
             if not no_git:
                 tracker.start("git")
                 if is_git_repo(project_path):
                     tracker.complete("git", "检测到现有仓库")
                 elif should_init_git:
-                    success, error_msg = init_git_repo(project_path, quiet=True)
+                    git_timings = {}
+                    success, error_msg = init_git_repo(project_path, quiet=True, paths=written, timings=git_timings)
                     if success:
-                        tracker.complete("git", "已初始化")
+                        phases = "，".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in git_timings.items())
+                        tracker.complete("git", f"已初始化，{len(written)} 个模板文件（{phases}）")
                     else:
                         tracker.error("git", "初始化失败")
                         git_error_message = error_msg
@@ -1159,12 +2150,15 @@ def init(
                 console.print(Panel("\n".join(env_lines), title="调试环境", border_style="magenta"))
             if not here and project_path.exists():
                 shutil.rmtree(project_path)
+            _emit_step_timings(tracker, timings, trace_file)
             raise typer.Exit(1)
         finally:
-            pass
+            if local_client is not None:
+                local_client.close()
 
     console.print(tracker.render())
     console.print("\n[bold green]项目已就绪。[/bold green]")
+    _emit_step_timings(tracker, timings, trace_file)
     
     # Show git error details if initialization failed
     if git_error_message:
@@ -1232,54 +2226,510 @@ def init(
     enhancement_lines = [
         "可用于规范的可选命令 [bright_black]（提高质量和信心）[/bright_black]",
         "",
-        f"○ [cyan]/speckit.clarify[/] [bright_black]（可选）[/bright_black] - 在规划前提出结构化问题以降低模糊区域的风险（如果使用，请在 [cyan]/speckit.plan[/] 之前运行）",
-        f"○ [cyan]/speckit.analyze[/] [bright_black]（可选）[/bright_black] - 跨工件一致性和对齐报告（在 [cyan]/speckit.tasks[/] 之后，[cyan]/speckit.implement[/] 之前）",
-        f"○ [cyan]/speckit.checklist[/] [bright_black]（可选）[/bright_black] - 生成质量检查清单以验证需求的完整性、清晰度和一致性（在 [cyan]/speckit.plan[/] 之后）"
+        "○ [cyan]/speckit.clarify[/] [bright_black]（可选）[/bright_black] - 在规划前提出结构化问题以降低模糊区域的风险（如果使用，请在 [cyan]/speckit.plan[/] 之前运行）",
+        "○ [cyan]/speckit.analyze[/] [bright_black]（可选）[/bright_black] - 跨工件一致性和对齐报告（在 [cyan]/speckit.tasks[/] 之后，[cyan]/speckit.implement[/] 之前）",
+        "○ [cyan]/speckit.checklist[/] [bright_black]（可选）[/bright_black] - 生成质量检查清单以验证需求的完整性、清晰度和一致性（在 [cyan]/speckit.plan[/] 之后）"
     ]
     enhancements_panel = Panel("\n".join(enhancement_lines), title="增强命令", border_style="cyan", padding=(1,2))
     console.print()
     console.print(enhancements_panel)
 
-@app.command()
-def check():
-    """检查是否安装了所有必需的工具。"""
+def _load_batch_manifest(manifest_path: Path) -> list[dict]:
+    """Load and validate an init-batch manifest.
+
+    The manifest is a JSON list (or an object with a "projects" list) of entries
+    such as {"path": "services/api", "ai": "claude", "script": "sh"}. "script"
+    defaults to the platform script type and relative paths resolve against the
+    current working directory.
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("projects")
+    if not isinstance(data, list) or not data:
+        raise ValueError("清单必须是非空的项目列表（或包含 \"projects\" 列表的对象）")
+
+    default_script = "ps" if os.name == "nt" else "sh"
+    projects = []
+    seen = set()
+    for i, entry in enumerate(data, 1):
+        if not isinstance(entry, dict) or not entry.get("path"):
+            raise ValueError(f"第 {i} 项缺少 \"path\"")
+        ai = entry.get("ai")
+        if ai not in AGENT_CONFIG:
+            raise ValueError(f"第 {i} 项的 AI 助手无效：{ai!r}。请从以下选择：{', '.join(AGENT_CONFIG.keys())}")
+        script = entry.get("script") or default_script
+        if script not in SCRIPT_TYPE_CHOICES:
+            raise ValueError(f"第 {i} 项的脚本类型无效：{script!r}。请从以下选择：{', '.join(SCRIPT_TYPE_CHOICES.keys())}")
+        path = Path(entry["path"]).expanduser().resolve()
+        if path in seen:
+            raise ValueError(f"项目路径重复：{path}")
+        seen.add(path)
+        projects.append({"path": path, "ai": ai, "script": script})
+    return projects
+
+def _fetch_batch_archive(client: "httpx.Client", cache: TemplateCache, release_data: dict, ai_assistant: str, script_type: str, *, github_token: str = None, debug: bool = False) -> Tuple[Path | bytes, str]:
+    """Return one template archive (cached path or raw bytes) plus a tracker detail."""
+    asset = select_template_asset(release_data, ai_assistant, script_type)
+    if asset is None:
+        raise RuntimeError(f"未找到匹配的发布资源（期望模式：spec-kit-template-{ai_assistant}-{script_type}）")
+    tag = release_data["tag_name"]
+    cached_blob = cache.lookup(tag, asset["name"], asset=asset)
+    if cached_blob is not None:
+        return cached_blob, f"{asset['name']}（缓存）"
+
+    source, _ = download_release_asset_to_cache(client, cache, tag, asset, github_token=github_token, debug=debug)
+    if isinstance(source, Path):
+        return source, asset["name"]
+    with source:
+        return source.read(), asset["name"]
+
+def _bootstrap_batch_project(project: dict, archive: Path | bytes, *, release: str, init_git: bool) -> str:
+    """Extract an archive into one init-batch target and finish its setup. Returns a tracker detail.
+
+    Raises:
+        RuntimeError: If the Git repository cannot be initialized (the extracted files are kept)
+    """
+    project_path = project["path"]
+    created = not project_path.exists()
+    project_path.mkdir(parents=True, exist_ok=True)
+    try:
+        # Every worker opens its own ZipFile; archive handles are not shareable between threads
+        source = archive if isinstance(archive, Path) else io.BytesIO(archive)
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            hashes = {}
+            written = extract_template_archive(zip_ref, project_path, merge=not created, hashes=hashes)
+        written.append(write_template_manifest(project_path, hashes, release=release, ai_assistant=project["ai"], script_type=project["script"]))
+    except Exception:
+        if created and project_path.exists():
+            shutil.rmtree(project_path)
+        raise
+
+    detail = f"{project['ai']}/{project['script']}，{len(hashes)} 个文件"
+    if init_git and not is_git_repo(project_path):
+        success, error_msg = init_git_repo(project_path, quiet=True, paths=written)
+        if not success:
+            raise RuntimeError(f"模板已解压，但 Git 初始化失败\n{error_msg}")
+        detail += "，Git 已初始化"
+    return detail
+
+@app.command("init-batch")
+def init_batch(
+    manifest: Path = typer.Argument(..., help="描述待初始化项目的 JSON 清单文件"),
+    jobs: int = typer.Option(min(8, os.cpu_count() or 1), "--jobs", "-j", min=1, help="并行下载和解压的线程数"),
+    no_git: bool = typer.Option(False, "--no-git", help="跳过 Git 仓库初始化"),
+    force: bool = typer.Option(False, "--force", help="目标目录已存在且非空时仍然合并模板"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="跳过 SSL/TLS 验证（不推荐）"),
+    debug: bool = typer.Option(False, "--debug", help="显示网络和解压失败的详细诊断输出"),
+    github_token: str = typer.Option(None, "--github-token", help="用于 API 请求的 GitHub token（或设置 GH_TOKEN 或 GITHUB_TOKEN 环境变量）"),
+    offline: bool = typer.Option(False, "--offline", help="仅使用本地模板缓存，不访问网络"),
+):
+    """
+    在一个进程中按清单批量初始化多个 Specify 项目。
+
+    最新发布只解析一次，每个不同的模板资源只下载一次（共享 HTTP/2 连接池），
+    然后在线程池中并行解压到所有目标目录。不检查 AI 助手工具。
+
+    清单示例（manifest.json）：
+        [
+          {"path": "services/api", "ai": "claude", "script": "sh"},
+          {"path": "services/web", "ai": "copilot"}
+        ]
+
+    示例：
+        specify init-batch manifest.json
+        specify init-batch manifest.json --jobs 16 --no-git
+    """
+    import httpx
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from rich.live import Live
+
     show_banner()
-    console.print("[bold]正在检查已安装的工具...[/bold]\n")
 
-    tracker = StepTracker("检查可用工具")
+    try:
+        projects = _load_batch_manifest(manifest)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]错误：[/red] 无法读取清单 {manifest}：{e}")
+        raise typer.Exit(1)
 
-    tracker.add("git", "Git 版本控制")
-    git_ok = check_tool("git", tracker=tracker)
+    conflicts = [
+        p["path"] for p in projects
+        if p["path"].exists() and (not p["path"].is_dir() or (not force and any(p["path"].iterdir())))
+    ]
+    if conflicts:
+        error_panel = Panel(
+            "\n".join(f"[cyan]{path}[/cyan]" for path in conflicts) + "\n\n"
+            "以上目标已存在且不为空。使用 [cyan]--force[/cyan] 合并到现有目录。",
+            title="[red]目录冲突[/red]",
+            border_style="red",
+            padding=(1, 2)
+        )
+        console.print(error_panel)
+        raise typer.Exit(1)
 
-    agent_results = {}
-    for agent_key, agent_config in AGENT_CONFIG.items():
-        agent_name = agent_config["name"]
-        requires_cli = agent_config["requires_cli"]
+    init_git = False
+    if not no_git:
+        init_git = check_tool("git")
+        if not init_git:
+            console.print("[yellow]未找到 Git - 将跳过仓库初始化[/yellow]")
 
-        tracker.add(agent_key, agent_name)
+    asset_keys = sorted({(p["ai"], p["script"]) for p in projects})
+    tracker = StepTracker(f"批量初始化 {len(projects)} 个 Specify 项目")
+    tracker.add("fetch", "获取最新发布")
+    for ai, script in asset_keys:
+        tracker.add(f"download:{ai}-{script}", f"模板 {ai}/{script}")
+    for p in projects:
+        tracker.add(f"project:{p['path']}", str(p["path"]))
+
+    cache = TemplateCache()
+    archives: dict[tuple[str, str], Path | bytes] = {}
+    releases: dict[tuple[str, str], str] = {}
+    failures: list[str] = []
+    repo_owner = "renhongliang"
+    repo_name = "spec-kit-chinese"
+    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
 
-        if requires_cli:
-            agent_results[agent_key] = check_tool(agent_key, tracker=tracker)
+    with Live(tracker, console=console, refresh_per_second=8, transient=True) as live:
+        tracker.attach_refresh(live.refresh)
+
+        if offline:
+            tracker.skip("fetch", "离线模式")
+            for ai, script in asset_keys:
+                key = f"download:{ai}-{script}"
+                cached = cache.latest(f"spec-kit-template-{ai}-{script}")
+                if cached is None:
+                    tracker.error(key, "缓存中没有匹配的模板")
+                    failures.append(f"{ai}/{script}：缓存中没有匹配的模板")
+                else:
+                    archives[(ai, script)] = cached[0]
+                    releases[(ai, script)] = cached[1]["tag"]
+                    tracker.complete(key, f"{cached[1]['asset']}（缓存）")
         else:
-            # IDE-based agent - skip CLI check and mark as optional
-            tracker.skip(agent_key, "基于 IDE，无需 CLI 检查")
-            agent_results[agent_key] = False  # Don't count IDE agents as "found"
+            limits = httpx.Limits(max_connections=jobs, max_keepalive_connections=jobs)
+            with httpx.Client(verify=_get_ssl_context() if not skip_tls else False, http2=True, limits=limits) as batch_client:
+                tracker.start("fetch", "正在联系 GitHub API")
+                try:
+                    release_data = fetch_latest_release(batch_client, api_url, github_token=github_token, debug=debug)
+                except Exception as e:
+                    tracker.error("fetch", "请求失败")
+                    failures.append(f"获取发布信息失败：{e}")
+                else:
+                    tracker.complete("fetch", f"发布版本 {release_data['tag_name']}")
+                    with ThreadPoolExecutor(max_workers=jobs) as pool:
+                        futures = {}
+                        for ai, script in asset_keys:
+                            tracker.start(f"download:{ai}-{script}")
+                            future = pool.submit(_fetch_batch_archive, batch_client, cache, release_data, ai, script, github_token=github_token, debug=debug)
+                            futures[future] = (ai, script)
+                        for future in as_completed(futures):
+                            ai, script = futures[future]
+                            key = f"download:{ai}-{script}"
+                            try:
+                                archives[(ai, script)], detail = future.result()
+                                releases[(ai, script)] = release_data["tag_name"]
+                                tracker.complete(key, detail)
+                            except Exception as e:
+                                tracker.error(key, "下载失败")
+                                failures.append(f"{ai}/{script}：{e}")
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+            for p in projects:
+                key = f"project:{p['path']}"
+                archive = archives.get((p["ai"], p["script"]))
+                if archive is None:
+                    tracker.skip(key, "模板不可用")
+                    continue
+                tracker.start(key, "正在解压")
+                futures[pool.submit(_bootstrap_batch_project, p, archive, release=releases[(p["ai"], p["script"])], init_git=init_git)] = p
+            for future in as_completed(futures):
+                p = futures[future]
+                key = f"project:{p['path']}"
+                try:
+                    tracker.complete(key, future.result())
+                except Exception as e:
+                    tracker.error(key, "初始化失败")
+                    failures.append(f"{p['path']}：{e}")
+
+    console.print(tracker.render())
+
+    if failures:
+        console.print()
+        console.print(Panel("\n\n".join(failures), title="[red]部分项目初始化失败[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    console.print(f"\n[bold green]{len(projects)} 个项目已就绪。[/bold green]")
+
+async def _prefetch_release_assets(assets: list[dict], tag: str, cache: TemplateCache, *, concurrency: int, verify, github_token: str = None, debug: bool = False, tracker: StepTracker | None = None) -> list[str]:
+    """Download release assets into the template cache concurrently. Returns failure messages."""
+    import asyncio
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failures: list[str] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(verify=verify, http2=True, limits=limits) as client:
+        async def fetch_one(asset: dict) -> None:
+            name = asset["name"]
+            async with semaphore:
+                if cache.lookup(tag, name, asset=asset) is not None:
+                    if tracker:
+                        tracker.complete(name, "已缓存")
+                    return
+                if tracker:
+                    tracker.start(name, "正在下载")
+                try:
+                    await download_release_asset_to_cache_async(client, cache, tag, asset, github_token=github_token, debug=debug)
+                except Exception as e:
+                    failures.append(f"{name}：{e}")
+                    if tracker:
+                        tracker.error(name, "下载失败")
+                    return
+                if tracker:
+                    tracker.complete(name, f"{asset['size']:,} 字节")
+
+        await asyncio.gather(*(fetch_one(asset) for asset in assets))
+    return failures
+
+@app.command()
+def prefetch(
+    all_agents: bool = typer.Option(False, "--all-agents", help="预取 AGENT_CONFIG 中所有 AI 助手的模板"),
+    ai_assistants: list[str] = typer.Option(None, "--ai", help="要预取的 AI 助手（可重复指定）"),
+    script_types: list[str] = typer.Option(None, "--script", help="要预取的脚本类型（可重复指定，默认 sh 和 ps）"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="同时进行的下载数上限"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="跳过 SSL/TLS 验证（不推荐）"),
+    debug: bool = typer.Option(False, "--debug", help="显示网络失败的详细诊断输出"),
+    github_token: str = typer.Option(None, "--github-token", help="用于 API 请求的 GitHub token（或设置 GH_TOKEN 或 GITHUB_TOKEN 环境变量）"),
+):
+    """
+    将最新发布的模板预先下载到本地模板缓存。
+
+    发布信息只获取一次，匹配的 spec-kit-template-* 资源通过异步 HTTP 并发下载。
+    预取完成后，[cyan]specify init --offline[/cyan] 可以完全不访问网络。
+
+    示例：
+        specify prefetch --all-agents
+        specify prefetch --ai claude --ai copilot --script sh
+    """
+    import asyncio
+    import httpx
+    from rich.live import Live
+
+    show_banner()
+
+    if all_agents:
+        selected_ais = list(AGENT_CONFIG.keys())
+    elif ai_assistants:
+        invalid = [ai for ai in ai_assistants if ai not in AGENT_CONFIG]
+        if invalid:
+            console.print(f"[red]错误：[/red] 无效的 AI 助手 '{', '.join(invalid)}'。请从以下选择：{', '.join(AGENT_CONFIG.keys())}")
+            raise typer.Exit(1)
+        selected_ais = list(dict.fromkeys(ai_assistants))
+    else:
+        console.print("[red]错误：[/red] 必须指定 --all-agents 或至少一个 --ai")
+        raise typer.Exit(1)
+
+    selected_scripts = list(dict.fromkeys(script_types or SCRIPT_TYPE_CHOICES.keys()))
+    invalid = [script for script in selected_scripts if script not in SCRIPT_TYPE_CHOICES]
+    if invalid:
+        console.print(f"[red]错误：[/red] 无效的脚本类型 '{', '.join(invalid)}'。请从以下选择：{', '.join(SCRIPT_TYPE_CHOICES.keys())}")
+        raise typer.Exit(1)
+
+    repo_owner = "renhongliang"
+    repo_name = "spec-kit-chinese"
+    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+    verify = _get_ssl_context() if not skip_tls else False
+
+    try:
+        with httpx.Client(verify=verify) as release_client:
+            release_data = fetch_latest_release(release_client, api_url, github_token=github_token, debug=debug)
+    except Exception as e:
+        console.print("[red]获取发布信息时出错[/red]")
+        console.print(Panel(str(e), title="获取错误", border_style="red"))
+        raise typer.Exit(1)
+
+    tag = release_data["tag_name"]
+    tracker = StepTracker(f"预取模板（发布版本 {tag}）")
+    assets = []
+    for ai in selected_ais:
+        for script in selected_scripts:
+            asset = select_template_asset(release_data, ai, script)
+            if asset is None:
+                key = f"spec-kit-template-{ai}-{script}"
+                tracker.add(key, key)
+                tracker.skip(key, "发布中无此模板")
+            elif asset not in assets:
+                tracker.add(asset["name"], asset["name"])
+                assets.append(asset)
+
+    cache = TemplateCache()
+    with Live(tracker, console=console, refresh_per_second=8, transient=True) as live:
+        tracker.attach_refresh(live.refresh)
+        failures = asyncio.run(_prefetch_release_assets(
+            assets, tag, cache, concurrency=concurrency, verify=verify, github_token=github_token, debug=debug, tracker=tracker,
+        ))
+
+    console.print(tracker.render())
+    if failures:
+        console.print()
+        console.print(Panel("\n\n".join(failures), title="[red]部分模板下载失败[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    console.print(f"\n[bold green]已缓存 {len(assets)} 个模板：[/bold green] [dim]{cache.root}[/dim]")
+
+@app.command()
+def upgrade(
+    ai_assistant: str = typer.Option(None, "--ai", help="模板对应的 AI 助手（默认读取 .specify/template-manifest.json）"),
+    script_type: str = typer.Option(None, "--script", help="模板对应的脚本类型：sh 或 ps（默认读取清单）"),
+    force: bool = typer.Option(False, "--force", help="覆盖本地修改过的模板文件"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="只显示将要进行的更改，不写入任何文件"),
+    offline: bool = typer.Option(False, "--offline", help="仅使用本地模板缓存，不访问网络"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="跳过 SSL/TLS 验证（不推荐）"),
+    debug: bool = typer.Option(False, "--debug", help="显示网络和解压失败的详细诊断输出"),
+    github_token: str = typer.Option(None, "--github-token", help="用于 API 请求的 GitHub token（或设置 GH_TOKEN 或 GITHUB_TOKEN 环境变量）"),
+):
+    """
+    将当前目录中的 Specify 项目升级到最新模板，只重写内容有变化的文件。
+
+    已安装模板文件的哈希记录在 .specify/template-manifest.json 中。未变化的文件
+    不会被写入（保留修改时间）；本地修改过的文件会被保留并报告为冲突，除非使用 --force。
+
+    示例：
+        specify upgrade
+        specify upgrade --dry-run
+        specify upgrade --ai claude --script sh   # 项目还没有模板清单时
+    """
+    show_banner()
+
+    project_path = Path.cwd()
+    if not (project_path / ".specify").is_dir():
+        console.print("[red]错误：[/red] 当前目录不是 Specify 项目（缺少 .specify 目录）")
+        raise typer.Exit(1)
+
+    manifest = load_template_manifest(project_path)
+    installed = manifest["files"] if manifest else {}
+    selected_ai = ai_assistant or (manifest or {}).get("ai")
+    selected_script = script_type or (manifest or {}).get("script") or ("ps" if os.name == "nt" else "sh")
+    if not selected_ai:
+        console.print(f"[red]错误：[/red] 未找到 {TEMPLATE_MANIFEST_PATH}，请使用 --ai 指定模板对应的 AI 助手")
+        raise typer.Exit(1)
+    if selected_ai not in AGENT_CONFIG:
+        console.print(f"[red]错误：[/red] 无效的 AI 助手 '{selected_ai}'。请从以下选择：{', '.join(AGENT_CONFIG.keys())}")
+        raise typer.Exit(1)
+    if selected_script not in SCRIPT_TYPE_CHOICES:
+        console.print(f"[red]错误：[/red] 无效的脚本类型 '{selected_script}'。请从以下选择：{', '.join(SCRIPT_TYPE_CHOICES.keys())}")
+        raise typer.Exit(1)
+    if not manifest:
+        console.print(f"[yellow]未找到 {TEMPLATE_MANIFEST_PATH}：[/yellow]与新模板内容不同的现有文件将被视为本地修改")
+
+    upgrade_client = None
+    if not offline:
+        # --offline runs never touch the network, so they skip importing httpx and truststore
+        import httpx
+        upgrade_client = httpx.Client(verify=_get_ssl_context() if not skip_tls else False)
+    try:
+        zip_source, meta = download_template_from_github(
+            selected_ai,
+            script_type=selected_script,
+            verbose=False,
+            show_progress=True,
+            client=upgrade_client,
+            debug=debug,
+            github_token=_github_token(github_token),
+            offline=offline,
+        )
+    finally:
+        if upgrade_client is not None:
+            upgrade_client.close()
+    try:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
+            result = upgrade_template_archive(zip_ref, project_path, installed, force=force, dry_run=dry_run)
+    except Exception as e:
+        console.print(Panel(f"升级失败：{e}", title="失败", border_style="red"))
+        raise typer.Exit(1)
+    finally:
+        # Cached archives are read in place; only the download buffer needs releasing
+        if not isinstance(zip_source, Path):
+            zip_source.close()
+
+    if not dry_run:
+        write_template_manifest(project_path, result["hashes"], release=meta["release"], ai_assistant=selected_ai, script_type=selected_script)
+
+    previous = (manifest or {}).get("release", "未知")
+    tree = Tree(f"[cyan]模板升级 {previous} → {meta['release']}[/cyan]" + ("（预演）" if dry_run else ""), guide_style="grey50")
+    for key, label, style in [
+        ("added", "新增", "green"),
+        ("updated", "更新", "green"),
+        ("removed", "删除", "yellow"),
+        ("conflicts", "本地已修改，未覆盖", "red"),
+        ("kept", "已从模板移除，但本地已修改，保留", "yellow"),
+    ]:
+        if result[key]:
+            branch = tree.add(f"[{style}]{label}[/{style}] [bright_black]({len(result[key])})[/bright_black]")
+            for rel_path in sorted(result[key]):
+                branch.add(rel_path)
+    tree.add(f"[bright_black]未变化 ({len(result['unchanged'])})[/bright_black]")
+    console.print(tree)
+
+    if result["conflicts"]:
+        console.print("\n[yellow]使用 --force 覆盖本地修改过的文件[/yellow]")
+    elif not dry_run:
+        console.print("\n[bold green]升级完成。[/bold green]")
+
+@app.command()
+def check(
+    json_output: bool = typer.Option(False, "--json", help="以 JSON 格式输出检测结果（适用于 CI）"),
+    timeout: float = typer.Option(TOOL_PROBE_TIMEOUT, "--timeout", min=0.1, help="单个工具检测的超时时间（秒）"),
+):
+    """检查是否安装了所有必需的工具。"""
+    from rich.live import Live
+
+    # (key, label, requires_cli) for every tool shown by the check
+    entries = [("git", "Git 版本控制", True)]
+    entries += [(agent_key, agent_config["name"], agent_config["requires_cli"]) for agent_key, agent_config in AGENT_CONFIG.items()]
+    # VS Code variants (not in agent config)
+    entries += [("code", "Visual Studio Code", True), ("code-insiders", "Visual Studio Code Insiders", True)]
+    probes = [key for key, _, requires_cli in entries if requires_cli]
+
+    if json_output:
+        results = detect_tools(probes, timeout=timeout)
+        report = {}
+        for key, label, requires_cli in entries:
+            if requires_cli:
+                report[key] = {"name": label, **results[key]}
+            else:
+                report[key] = {"name": label, "status": "skipped", "path": None}
+        print(json.dumps({"tools": report}, ensure_ascii=False, indent=2))
+        return
+
+    show_banner()
+    console.print("[bold]正在检查已安装的工具...[/bold]\n")
 
-    # Check VS Code variants (not in agent config)
-    tracker.add("code", "Visual Studio Code")
-    code_ok = check_tool("code", tracker=tracker)
+    tracker = StepTracker("检查可用工具")
+    for key, label, requires_cli in entries:
+        tracker.add(key, label)
+        if not requires_cli:
+            # IDE-based agent - skip CLI check and mark as optional
+            tracker.skip(key, "基于 IDE，无需 CLI 检查")
 
-    tracker.add("code-insiders", "Visual Studio Code Insiders")
-    code_insiders_ok = check_tool("code-insiders", tracker=tracker)
+    with Live(tracker, console=console, refresh_per_second=8, transient=True) as live:
+        tracker.attach_refresh(live.refresh)
+        results = detect_tools(probes, timeout=timeout, tracker=tracker)
 
     console.print(tracker.render())
 
     console.print("\n[bold green]Specify CLI 已准备就绪！[/bold green]")
 
-    if not git_ok:
+    if results["git"]["status"] != "available":
         console.print("[dim]提示：安装 git 以进行仓库管理[/dim]")
 
-    if not any(agent_results.values()):
+    # IDE-based agents don't count as "found"
+    agent_keys = [key for key, config in AGENT_CONFIG.items() if config["requires_cli"]]
+    if not any(results[key]["status"] == "available" for key in agent_keys):
         console.print("[dim]提示：安装 AI 助手以获得最佳体验[/dim]")
 
 @app.command()
@@ -1315,26 +2765,19 @@ def version():
     release_date = "unknown"
     
     try:
-        response = client.get(
-            api_url,
-            timeout=10,
-            follow_redirects=True,
-            headers=_github_auth_headers(),
-        )
-        if response.status_code == 200:
-            release_data = response.json()
-            template_version = release_data.get("tag_name", "unknown")
-            # Remove 'v' prefix if present
-            if template_version.startswith("v"):
-                template_version = template_version[1:]
-            release_date = release_data.get("published_at", "unknown")
-            if release_date != "unknown":
-                # Format the date nicely
-                try:
-                    dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
-                    release_date = dt.strftime("%Y-%m-%d")
-                except Exception:
-                    pass
+        release_data = fetch_latest_release(_get_client(), api_url, timeout=10)
+        template_version = release_data.get("tag_name", "unknown")
+        # Remove 'v' prefix if present
+        if template_version.startswith("v"):
+            template_version = template_version[1:]
+        release_date = release_data.get("published_at", "unknown")
+        if release_date != "unknown":
+            # Format the date nicely
+            try:
+                dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
+                release_date = dt.strftime("%Y-%m-%d")
+            except Exception:
+                pass
     except Exception:
         pass
 